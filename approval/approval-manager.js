@@ -15,6 +15,7 @@ const { requestApprovalViaSlack } = require('./slack-approval.js');
  *   - scorecardPath: Path to scorecard JSON
  *   - jobConfigPath: Path to job config JSON
  *   - timeout: Timeout in seconds
+ *   - logOutput: Optional path for the decision log
  * @returns {Promise<Object>} - Approval result
  */
 async function runApprovalWorkflow(options) {
@@ -270,15 +271,19 @@ function loadJobContext(jobConfigPath) {
  * Log approval decision to file
  */
 function logApprovalDecision(result, options) {
-  const logsDir = path.join(process.cwd(), 'reports', 'approvals');
+  // Callers may pass an explicit path (--log-output) so they can read the decision back directly
+  let logPath = options.logOutput;
+  if (!logPath) {
+    const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
+    const jobId = result.scorecard?.jobId || 'unknown';
+    logPath = path.join(process.cwd(), 'reports', 'approvals', `approval-${jobId}-${timestamp}.json`);
+  }
+
+  const logsDir = path.dirname(logPath);
   if (!fs.existsSync(logsDir)) {
     fs.mkdirSync(logsDir, { recursive: true });
   }
 
-  const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-  const jobId = result.scorecard?.jobId || 'unknown';
-  const logPath = path.join(logsDir, `approval-${jobId}-${timestamp}.json`);
-
   try {
     fs.writeFileSync(logPath, JSON.stringify(result, null, 2));
     console.log(`[Approval Manager] Decision logged: ${logPath}`);
@@ -315,6 +320,8 @@ if (require.main === module) {
       options.channel = args[++i];
     } else if (arg === '--webhook-url' && i + 1 < args.length) {
       options.webhookUrl = args[++i];
+    } else if (arg === '--log-output' && i + 1 < args.length) {
+      options.logOutput = args[++i];
     } else if (arg === '--help') {
       console.log(`
 Approval Manager - Human-in-the-loop PDF validation
@@ -329,6 +336,7 @@ Options:
   --timeout <seconds>     Timeout in seconds (default: 3600)
   --channel <channel>     Slack channel for approval (default: #design-approvals)
   --webhook-url <url>     Slack webhook URL (or use SLACK_WEBHOOK_URL env var)
+  --log-output <path>     Write the decision log to this path (default: reports/approvals/)
   --help                  Show this help
 
 Modes:
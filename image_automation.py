@@ -32,10 +32,34 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import base64
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add MCP integration
 sys.path.append(os.path.join(os.path.dirname(__file__), 'mcp-local'))
 
 
+def _json_loads(data: str) -> Any:
+    """Parse JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    """Serialize to indented JSON for console output, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(obj, indent=2, default=str)
+
+
 class ImageAutomation:
     """Image automation for InDesign via MCP integration"""
 
@@ -94,6 +118,11 @@ class ImageAutomation:
             position
         )
 
+        return self._place_optimized(image_path, optimized_path, frame_bounds)
+
+    def _place_optimized(self, image_path: str, optimized_path: str,
+                         frame_bounds: Dict[str, float]) -> Dict[str, Any]:
+        """Place an already-optimized image in its InDesign frame"""
         # Place in InDesign via MCP
         placement_result = self._place_via_mcp(
             optimized_path,
@@ -286,15 +315,21 @@ class ImageAutomation:
         """
         print(f"\n📦 Batch placing {len(image_mappings)} images...")
 
+        # Optimize every image up front, then place serially
+        prepared = self._prepare_mappings(image_mappings)
+
         results = []
-        for i, mapping in enumerate(image_mappings):
+        for i, (mapping, prep) in enumerate(zip(image_mappings, prepared)):
             print(f"\n[{i+1}/{len(image_mappings)}]")
             try:
-                result = self.place_image_in_frame(
+                if not prep['success']:
+                    raise RuntimeError(prep['error'])
+
+                print(f"   📐 Placing {Path(mapping['image_path']).name}")
+                result = self._place_optimized(
                     mapping['image_path'],
-                    mapping['frame_bounds'],
-                    fit_mode=mapping.get('fit_mode', 'fill'),
-                    position=mapping.get('position', 'center')
+                    prep['optimized'],
+                    mapping['frame_bounds']
                 )
                 results.append({'success': True, 'result': result})
             except Exception as e:
@@ -306,6 +341,30 @@ class ImageAutomation:
 
         return results
 
+    def _prepare_mappings(self, image_mappings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Optimize images for their frames, in order
+
+        Runs in-process: _optimize_for_frame is still a pass-through, so a process
+        pool would only add worker startup and pickling. Revisit once it resizes.
+        """
+        return [self._prepare_mapping(m) for m in image_mappings]
+
+    def _prepare_mapping(self, mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """Optimize a single mapping's image for its frame"""
+        try:
+            frame_bounds = mapping['frame_bounds']
+            optimized_path = self._optimize_for_frame(
+                mapping['image_path'],
+                int(frame_bounds['width']),
+                int(frame_bounds['height']),
+                mapping.get('fit_mode', 'fill'),
+                mapping.get('position', 'center')
+            )
+            return {'success': True, 'optimized': optimized_path}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
     def optimize_all_document_images(self, target_use: str = 'print') -> Dict[str, Any]:
         """
         Optimize all images in current InDesign document
@@ -374,7 +433,7 @@ class ImageAutomation:
                             break
 
                 if json_end > 0:
-                    return json.loads(json_str[:json_end])
+                    return _json_loads(json_str[:json_end])
 
             # Fallback: return output as string
             return {'output': output, 'success': True}
@@ -517,7 +576,7 @@ def example_usage():
             overlay_color='nordshore',
             overlay_opacity=0.4
         )
-        print(f"\n✅ Result: {json.dumps(result, indent=2, default=str)}")
+        print(f"\n✅ Result: {_json_dumps_pretty(result)}")
 
     # Example 2: Enforce logo clearspace
     print("\n" + "="*60)
@@ -531,7 +590,7 @@ def example_usage():
             x=100,
             y=100
         )
-        print(f"\n✅ Clearspace: {json.dumps(clearspace, indent=2)}")
+        print(f"\n✅ Clearspace: {_json_dumps_pretty(clearspace)}")
 
     # Example 3: Generate and place hero
     print("\n" + "="*60)
@@ -7,8 +7,14 @@ Transport: stdio only
 
 import sys
 import os
-from typing import Optional, Literal, List, Dict, Any
-from pathlib import Path
+import csv
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Literal, List, Dict, Any, Tuple, Deque
 
 # Add the adb-mcp/mcp directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'adb-mcp', 'mcp'))
@@ -26,6 +32,9 @@ APPLICATION = "indesign"
 PROXY_URL = 'http://localhost:8013'
 PROXY_TIMEOUT = 30
 
+# Rows per tableFromRows/tableAppendRows command when streaming CSVs
+CSV_ROW_BATCH = 500
+
 socket_client.configure(
     app=APPLICATION,
     url=PROXY_URL,
@@ -34,54 +43,295 @@ socket_client.configure(
 
 init(APPLICATION, socket_client)
 
+# Allowed values for the Literal-typed tool arguments
+_UNITS = frozenset({"pt", "mm", "in"})
+_OVERFLOW = frozenset({"expand", "truncate", "autoflow"})
+_FIT = frozenset({"none", "frame", "content", "proportionally", "contentAware"})
+_TARGET = frozenset({"text", "frame", "page", "object"})
+_PRESET = frozenset({"High Quality Print", "Press Quality", "PDF/X-4", "Digital"})
+_SAVE = frozenset({"yes", "no", "prompt"})
+_SCOPE = frozenset({"document", "page", "story"})
+_ORDER = frozenset({"reading", "articles"})
+_ALT_TEXT_POLICY = frozenset({"required", "optional"})
+
+# Cached plugin version served by ping()
+PING_CACHE_TTL = 5.0
+_ping_cache: Dict[str, Any] = {"ts": 0.0, "version": "unknown", "refreshing": False}
+
 # Store for idempotency
 _request_cache: Dict[str, Any] = {}
 
-def _handle_response(response: dict, request_id: Optional[str] = None) -> dict:
+# Linked file paths placed in the active document, checked locally by preflight_run
+_link_paths: Dict[str, None] = {}
+
+# Single sender thread keeps fire-and-forget and awaited commands in order
+_sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="indesign-send")
+_pending_lock = threading.Lock()
+# Queued commands sent and failed since the last flush_and_sync; only the
+# latest failure messages are kept so a client that never syncs can't grow them
+_queued_sent = 0
+_queued_failed = 0
+_queued_errors: Deque[str] = deque(maxlen=100)
+
+# Queued commands are flushed after max(min_ms, factor * RTT)
+_outbox: List[dict] = []
+_outbox_timer: Optional[threading.Timer] = None
+_batch_min_ms = 1.0
+_batch_rtt_factor = 0.5
+_rtt_ema = 0.0  # seconds, exponential moving average of sendCommand round-trips
+
+# BatchAccumulator defaults; the outbox is also flushed once it holds MAX_BATCH_SIZE
+BATCH_INTERVAL_MS = float(os.environ.get("INDESIGN_MCP_BATCH_INTERVAL_MS", "10"))
+MAX_BATCH_SIZE = int(os.environ.get("INDESIGN_MCP_MAX_BATCH_SIZE", "16"))
+_accumulator: Optional["BatchAccumulator"] = None
+
+def _timed_send(command: dict) -> dict:
+    """Run sendCommand and fold its round-trip time into _rtt_ema"""
+    global _rtt_ema
+    start = time.perf_counter()
+    response = sendCommand(command)
+    sample = time.perf_counter() - start
+    _rtt_ema = sample if not _rtt_ema else 0.2 * sample + 0.8 * _rtt_ema
+    return response
+
+def _flush_interval() -> float:
+    """Seconds to wait before flushing the outbox"""
+    return max(_batch_min_ms / 1000.0, _batch_rtt_factor * _rtt_ema)
+
+def _report_queued(future: Future) -> None:
+    """Done-callback for a queued send: log and record a failure as soon as it happens"""
+    global _queued_failed
+    try:
+        response = future.result()
+        if response.get("status") == "SUCCESS":
+            return
+        error = response.get("message", "Unknown error")
+    except Exception as e:
+        error = str(e)
+
+    print(f"Queued command failed: {error}", file=sys.stderr)
+    with _pending_lock:
+        _queued_failed += 1
+        _queued_errors.append(error)
+
+def _flush_outbox() -> None:
+    """Send any queued commands, one sendCommand each in the order they were queued"""
+    global _outbox_timer, _queued_sent
+    with _pending_lock:
+        if _outbox_timer is not None:
+            _outbox_timer.cancel()
+            _outbox_timer = None
+
+        if not _outbox:
+            return
+
+        commands = _outbox[:]
+        _outbox.clear()
+        _queued_sent += len(commands)
+
+        # Queued commands are unrelated to each other, so they are not wrapped in
+        # the atomic batch command where one bad op would roll back the rest
+        futures = [_sender.submit(_timed_send, command) for command in commands]
+
+    # Outside the lock: the callback takes it and may run right away
+    for future in futures:
+        future.add_done_callback(_report_queued)
+
+def _send_now(command: dict) -> dict:
+    """Send a command immediately, after anything still queued in the outbox"""
+    _flush_outbox()
+    return _sender.submit(_timed_send, command).result()
+
+def _send_command(command: dict, await_response: bool = True) -> dict:
     """
-    Convert internal response to standardized format.
-    Returns { ok:true, ... } or { ok:false, error:{code,msg,details?} }
+    Send a command via the sender thread. With await_response=False the
+    command is queued for the next outbox flush and a synthetic ack is
+    returned immediately; failures are logged as they happen and
+    flush_and_sync reports them.
+    Inside a BatchAccumulator block, commands are collected into its batches.
     """
-    if request_id and request_id in _request_cache:
-        return _request_cache[request_id]
+    global _outbox_timer
+    if _accumulator is not None:
+        return _accumulator.add(command)
 
-    result = {}
+    if await_response:
+        return _send_now(command)
 
+    with _pending_lock:
+        _outbox.append(command)
+        full = len(_outbox) >= MAX_BATCH_SIZE
+        if _outbox_timer is None and not full:
+            _outbox_timer = threading.Timer(_flush_interval(), _flush_outbox)
+            _outbox_timer.daemon = True
+            _outbox_timer.start()
+
+    if full:
+        _flush_outbox()
+
+    return {"status": "SUCCESS", "response": {"queued": True}}
+
+class BatchAccumulator:
+    """
+    Collects commands sent by tools inside a `with` block into batch
+    commands, turning N round-trips into N / max_batch_size.
+
+    A batch is sent when it reaches max_batch_size ops, when
+    batch_interval_ms has passed since its first op, and on exit. Tools
+    inside the block get a {queued: true} ack; the raw response of every
+    batch sent is collected in `responses`.
+
+        with BatchAccumulator() as acc:
+            set_units("mm")
+            place_text(...)
+        failed = [r for r in acc.responses if r.get("status") != "SUCCESS"]
+    """
+
+    def __init__(self, batch_interval_ms: float = BATCH_INTERVAL_MS,
+                 max_batch_size: int = MAX_BATCH_SIZE):
+        self.interval = batch_interval_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.ops: List[Dict[str, Any]] = []
+        self.responses: List[dict] = []
+        self._started = 0.0
+        self._previous: Optional["BatchAccumulator"] = None
+
+    def __enter__(self) -> "BatchAccumulator":
+        global _accumulator
+        self._previous = _accumulator
+        _accumulator = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        global _accumulator
+        _accumulator = self._previous
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def add(self, command: dict) -> dict:
+        """Queue a command as a batch op, flushing if size or interval is reached"""
+        if not self.ops:
+            self._started = time.perf_counter()
+
+        self.ops.append({"tool": command["action"], "args": command["options"]})
+
+        if (len(self.ops) >= self.max_batch_size
+                or time.perf_counter() - self._started >= self.interval):
+            self.flush()
+
+        return {"status": "SUCCESS", "response": {"queued": True}}
+
+    def flush(self) -> Optional[dict]:
+        """Send the collected ops as one batch command"""
+        if not self.ops:
+            return None
+
+        ops, self.ops = self.ops, []
+        response = _send_now(createCommand("batch", {"ops": ops}))
+        self.responses.append(response)
+        return response
+
+def _build_result(response: dict) -> dict:
+    """Build the standardized result dict for a raw command response"""
     if response.get("status") == "SUCCESS":
-        result = {
+        return {
             "ok": True,
             "data": response.get("response", {}),
             "activeDocument": response.get("activeDocument")
         }
-    else:
-        result = {
-            "ok": False,
-            "error": {
-                "code": "COMMAND_FAILED",
-                "msg": response.get("message", "Unknown error"),
-                "details": response
-            }
+
+    return {
+        "ok": False,
+        "error": {
+            "code": "COMMAND_FAILED",
+            "msg": response.get("message", "Unknown error"),
+            "details": response
         }
+    }
+
+def _is_queued_ack(response: dict) -> bool:
+    """True for the synthetic ack returned for queued (not yet sent) commands"""
+    data = response.get("response")
+    return isinstance(data, dict) and data.get("queued") is True
 
-    if request_id:
+def _handle_response(response: dict, request_id: Optional[str] = None) -> dict:
+    """
+    Convert internal response to standardized format.
+    Returns { ok:true, ... } or { ok:false, error:{code,msg,details?} }
+    """
+    # Fast path: most calls carry no idempotency key
+    if not request_id:
+        return _build_result(response)
+
+    if request_id in _request_cache:
+        return _request_cache[request_id]
+
+    result = _build_result(response)
+    # A queued ack isn't the command's outcome; caching it would answer every
+    # retry with "queued" instead of the real result
+    if not _is_queued_ack(response):
         _request_cache[request_id] = result
 
     return result
 
-def _validate_path(path: str, allow_unc: bool = False) -> str:
-    """Validate and return absolute Windows path"""
+def _check_literal(value: str, allowed: frozenset, name: str) -> None:
+    """Raise ValueError if value is not one of the allowed literals"""
+    if value not in allowed:
+        raise ValueError(f"Invalid {name}: {value!r} (expected one of {sorted(allowed)})")
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_path(path: str, allow_unc: bool = False) -> str:
+    """Validate and resolve a path (cached; clients reuse the same paths a lot)"""
     if not path:
         raise ValueError("Path cannot be empty")
 
-    p = Path(path)
-
     if not allow_unc and path.startswith("\\\\"):
         raise ValueError("UNC paths not allowed")
 
-    if not p.is_absolute():
+    if not os.path.isabs(path):
         raise ValueError(f"Path must be absolute: {path}")
 
-    return str(p.resolve())
+    return os.path.realpath(path)
+
+def _validate_path(path: str, allow_unc: bool = False, stat: bool = False) -> Tuple[str, Optional[os.stat_result]]:
+    """
+    Validate and return absolute Windows path along with its stat result.
+    Only input paths ask for stat=True; the result is None if the path does
+    not exist or stat was not requested, so output paths cost no syscall.
+    """
+    resolved = _resolve_path(path, allow_unc)
+    if not stat:
+        return resolved, None
+
+    try:
+        st = os.stat(resolved)
+    except OSError:
+        st = None
+
+    return resolved, st
+
+def _missing_links() -> List[str]:
+    """Return tracked link paths that no longer exist, stat-ing them in parallel"""
+    paths = list(_link_paths)
+    if len(paths) <= 1:
+        return [p for p in paths if not os.path.exists(p)]
+
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as executor:
+        exists = list(executor.map(os.path.exists, paths))
+
+    return [p for p, ok in zip(paths, exists) if not ok]
+
+def _iter_csv_batches(path: str, batch_size: int):
+    """Yield lists of CSV rows, at most batch_size rows each"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        batch = []
+        for row in csv.reader(f):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
 # ============================================================================
 # CORE V1 - Must-have tools
@@ -115,6 +365,8 @@ def create_document(
         {ok: true, data: {...}} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(units, _UNITS, "units")
+
         # Convert to points (InDesign's internal unit)
         unit_to_pt = {"pt": 1, "mm": 2.834645669, "in": 72}
         multiplier = unit_to_pt[units]
@@ -142,8 +394,14 @@ def create_document(
             "units": units
         })
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        response = _send_command(command)
+        result = _handle_response(response, request_id)
+
+        # A different document is now active; forget the tracked links
+        if result.get("ok"):
+            _link_paths.clear()
+
+        return result
 
     except Exception as e:
         return {
@@ -172,9 +430,9 @@ def load_template(
         {ok: true, data: {...}} or {ok: false, error: {...}}
     """
     try:
-        validated_path = _validate_path(path)
+        validated_path, st = _validate_path(path, stat=True)
 
-        if not Path(validated_path).exists():
+        if st is None:
             return {
                 "ok": False,
                 "error": {
@@ -188,8 +446,14 @@ def load_template(
             "useMasterPages": use_master_pages
         })
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        response = _send_command(command)
+        result = _handle_response(response, request_id)
+
+        # A different document is now active; forget the tracked links
+        if result.get("ok"):
+            _link_paths.clear()
+
+        return result
 
     except Exception as e:
         return {
@@ -230,6 +494,8 @@ def place_text(
         {ok: true, data: {id, bounds}} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(overflow, _OVERFLOW, "overflow")
+
         command = createCommand("placeText", {
             "page": page,
             "x": x,
@@ -241,7 +507,7 @@ def place_text(
             "overflow": overflow
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -281,9 +547,11 @@ def place_image(
         {ok: true, data: {id, bounds}} or {ok: false, error: {...}}
     """
     try:
-        validated_path = _validate_path(path)
+        _check_literal(fit, _FIT, "fit")
 
-        if not Path(validated_path).exists():
+        validated_path, st = _validate_path(path, stat=True)
+
+        if st is None:
             return {
                 "ok": False,
                 "error": {
@@ -302,8 +570,13 @@ def place_image(
             "fit": fit
         })
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        response = _send_command(command)
+        result = _handle_response(response, request_id)
+
+        if result.get("ok") and not _is_queued_ack(response):
+            _link_paths[validated_path] = None
+
+        return result
 
     except Exception as e:
         return {
@@ -319,6 +592,7 @@ def apply_style(
     target: Literal["text", "frame", "page", "object"],
     id: Any,
     style: str,
+    await_response: bool = True,
     request_id: Optional[str] = None
 ) -> dict:
     """
@@ -328,19 +602,22 @@ def apply_style(
         target: Type of target - "text", "frame", "page", or "object"
         id: Target identifier - can be string ID, or dict with {page, frameId?, range?}
         style: Style name to apply
+        await_response: If False, queue the command and return {queued: true} immediately
         request_id: Optional idempotency key
 
     Returns:
         {ok: true} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(target, _TARGET, "target")
+
         command = createCommand("applyStyle", {
             "target": target,
             "id": id,
             "style": style
         })
 
-        response = sendCommand(command)
+        response = _send_command(command, await_response)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -378,10 +655,12 @@ def export_pdf(
         {ok: true, data: {path}} or {ok: false, error: {...}}
     """
     try:
-        validated_path = _validate_path(output_path)
+        _check_literal(preset, _PRESET, "preset")
+
+        validated_path, _ = _validate_path(output_path)
 
         # Ensure parent directory exists
-        Path(validated_path).parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(validated_path), exist_ok=True)
 
         command = createCommand("exportPDF", {
             "outputPath": validated_path,
@@ -392,7 +671,7 @@ def export_pdf(
             "viewPDF": view_pdf
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         result = _handle_response(response, request_id)
 
         if result.get("ok"):
@@ -427,9 +706,10 @@ def save_document(
         {ok: true, data: {path}} or {ok: false, error: {...}}
     """
     try:
-        validated_path = _validate_path(path)
+        # Existence only matters when overwriting is refused
+        validated_path, st = _validate_path(path, stat=not overwrite)
 
-        if not overwrite and Path(validated_path).exists():
+        if not overwrite and st is not None:
             return {
                 "ok": False,
                 "error": {
@@ -439,14 +719,14 @@ def save_document(
             }
 
         # Ensure parent directory exists
-        Path(validated_path).parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(validated_path), exist_ok=True)
 
         command = createCommand("saveDocument", {
             "path": validated_path,
             "overwrite": overwrite
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -474,12 +754,20 @@ def close_document(
         {ok: true} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(save, _SAVE, "save")
+
         command = createCommand("closeDocument", {
             "save": save
         })
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        response = _send_command(command)
+        result = _handle_response(response, request_id)
+
+        # A different document is now active; forget the tracked links
+        if result.get("ok"):
+            _link_paths.clear()
+
+        return result
 
     except Exception as e:
         return {
@@ -504,7 +792,7 @@ def read_document_info(
     try:
         command = createCommand("readDocumentInfo", {})
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -555,7 +843,7 @@ def grid_frame_text(
             "style": style
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -597,9 +885,9 @@ def table_from_csv(
         {ok: true, data: {id, rows, cols}} or {ok: false, error: {...}}
     """
     try:
-        validated_path = _validate_path(csv_path)
+        validated_path, st = _validate_path(csv_path, stat=True)
 
-        if not Path(validated_path).exists():
+        if st is None:
             return {
                 "ok": False,
                 "error": {
@@ -608,19 +896,62 @@ def table_from_csv(
                 }
             }
 
-        command = createCommand("tableFromCSV", {
+        # Stream the CSV in row batches: the first batch creates the table,
+        # the rest are appended so InDesign never parses the whole file at once
+        batches = _iter_csv_batches(validated_path, CSV_ROW_BATCH)
+        first_batch = next(batches, [])
+        if not first_batch:
+            return {
+                "ok": False,
+                "error": {
+                    "code": "CSV_EMPTY",
+                    "msg": f"CSV has no rows: {validated_path}"
+                }
+            }
+
+        command = createCommand("tableFromRows", {
             "page": page,
             "x": x,
             "y": y,
-            "csvPath": validated_path,
+            "rows": first_batch,
             "width": width,
             "maxHeight": max_height,
             "tableStyle": table_style,
             "headerRow": header_row
         })
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        response = _send_command(command)
+        result = _handle_response(response, request_id)
+        if not result.get("ok"):
+            return result
+
+        table_id = result["data"].get("id")
+        row_count = len(first_batch)
+
+        # Bind hot-loop globals to locals (LOAD_FAST instead of LOAD_GLOBAL)
+        send, create = _send_command, createCommand
+
+        # Appends go out MAX_BATCH_SIZE at a time as batch commands
+        with BatchAccumulator() as acc:
+            for rows in batches:
+                send(create("tableAppendRows", {
+                    "tableId": table_id,
+                    "rows": rows
+                }))
+                row_count += len(rows)
+
+        # A batch can succeed as a whole while one of its append ops failed
+        for append_response in acc.responses:
+            if append_response.get("status") != "SUCCESS":
+                return _handle_response(append_response)
+            for op in (append_response.get("response") or {}).get("results") or []:
+                if isinstance(op, dict) and op.get("status", "SUCCESS") != "SUCCESS":
+                    return _handle_response(op)
+
+        result["data"]["rows"] = row_count
+        result["data"]["cols"] = max(len(row) for row in first_batch)
+
+        return result
 
     except Exception as e:
         return {
@@ -666,7 +997,7 @@ def place_svg_chart(
             "height": height
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -682,6 +1013,7 @@ def place_svg_chart(
 def master_apply(
     master_name: str,
     pages: Any,  # Can be list of ints or "all"
+    await_response: bool = True,
     request_id: Optional[str] = None
 ) -> dict:
     """
@@ -690,6 +1022,7 @@ def master_apply(
     Args:
         master_name: Name of master page to apply
         pages: List of page numbers or "all"
+        await_response: If False, queue the command and return {queued: true} immediately
         request_id: Optional idempotency key
 
     Returns:
@@ -701,7 +1034,7 @@ def master_apply(
             "pages": pages
         })
 
-        response = sendCommand(command)
+        response = _send_command(command, await_response)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -717,6 +1050,7 @@ def master_apply(
 def link_replace_all(
     find_dir: str,
     replace_dir: str,
+    await_response: bool = True,
     request_id: Optional[str] = None
 ) -> dict:
     """
@@ -725,22 +1059,33 @@ def link_replace_all(
     Args:
         find_dir: Directory path to find
         replace_dir: Directory path to replace with
+        await_response: If False, queue the command and return {queued: true} immediately
         request_id: Optional idempotency key
 
     Returns:
         {ok: true, data: {replaced: count}} or {ok: false, error: {...}}
     """
     try:
-        find_path = _validate_path(find_dir)
-        replace_path = _validate_path(replace_dir)
+        find_path, _ = _validate_path(find_dir)
+        replace_path, _ = _validate_path(replace_dir)
 
         command = createCommand("linkReplaceAll", {
             "findDir": find_path,
             "replaceDir": replace_path
         })
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        response = _send_command(command, await_response)
+        result = _handle_response(response, request_id)
+
+        # A queued ack doesn't mean InDesign relinked anything yet
+        if result.get("ok") and not _is_queued_ack(response):
+            # Match whole path components: /assets/img must not catch /assets/images
+            prefix = find_path.rstrip(os.sep) + os.sep
+            for link in [p for p in _link_paths if p == find_path or p.startswith(prefix)]:
+                del _link_paths[link]
+                _link_paths[replace_path + link[len(find_path):]] = None
+
+        return result
 
     except Exception as e:
         return {
@@ -757,6 +1102,7 @@ def find_replace_text(
     replace: str,
     scope: Literal["document", "page", "story"] = "document",
     style_constraint: Optional[str] = None,
+    await_response: bool = True,
     request_id: Optional[str] = None
 ) -> dict:
     """
@@ -767,12 +1113,15 @@ def find_replace_text(
         replace: Replacement text
         scope: Search scope - "document", "page", or "story"
         style_constraint: Optional style name to limit search
+        await_response: If False, queue the command and return {queued: true} immediately
         request_id: Optional idempotency key
 
     Returns:
         {ok: true, data: {replaced: count}} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(scope, _SCOPE, "scope")
+
         command = createCommand("findReplaceText", {
             "find": find,
             "replace": replace,
@@ -780,7 +1129,7 @@ def find_replace_text(
             "styleConstraint": style_constraint
         })
 
-        response = sendCommand(command)
+        response = _send_command(command, await_response)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -818,7 +1167,7 @@ def toc_generate(
             "destPage": dest_page
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -846,11 +1195,23 @@ def preflight_run(
         {ok: true, data: {errors: [], warnings: []}} or {ok: false, error: {...}}
     """
     try:
+        # Fail fast on missing links without a round-trip to InDesign
+        missing = _missing_links()
+        if missing:
+            return {
+                "ok": True,
+                "data": {
+                    "errors": [{"type": "missingLink", "path": p} for p in missing],
+                    "warnings": [],
+                    "source": "local"
+                }
+            }
+
         command = createCommand("preflightRun", {
             "profile": profile
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -886,13 +1247,16 @@ def accessibility_tag(
         {ok: true} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(order, _ORDER, "order")
+        _check_literal(alt_text_policy, _ALT_TEXT_POLICY, "alt_text_policy")
+
         command = createCommand("accessibilityTag", {
             "order": order,
             "altTextPolicy": alt_text_policy,
             "lang": lang
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -930,7 +1294,7 @@ def check_brand_rules(
             "minLogoClearspace": min_logo_clearspace
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -966,10 +1330,10 @@ def package_document(
         {ok: true, data: {path, report}} or {ok: false, error: {...}}
     """
     try:
-        validated_path = _validate_path(output_dir)
+        validated_path, _ = _validate_path(output_dir)
 
         # Ensure directory exists
-        Path(validated_path).mkdir(parents=True, exist_ok=True)
+        os.makedirs(validated_path, exist_ok=True)
 
         command = createCommand("packageDocument", {
             "outputDir": validated_path,
@@ -979,7 +1343,7 @@ def package_document(
             "report": report
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -991,8 +1355,13 @@ def package_document(
             }
         }
 
+def _prep_variant(variant: Dict[str, str]) -> Dict[str, str]:
+    """Validate a variant's output path"""
+    output_path, _ = _validate_path(variant["outputPath"])
+    return {**variant, "outputPath": output_path}
+
 @mcp.tool()
-def export_variants(
+async def export_variants(
     variants: List[Dict[str, str]],
     parallel: bool = False,
     request_id: Optional[str] = None
@@ -1002,25 +1371,68 @@ def export_variants(
 
     Args:
         variants: List of export configs [{preset, outputPath}]
-        parallel: Export in parallel (if supported)
+        parallel: Ignored, kept for compatibility. Commands go through a single
+                  sender thread, so variants always export serially in one batch
         request_id: Optional idempotency key
 
     Returns:
         {ok: true, data: {exports: []}} or {ok: false, error: {...}}
     """
     try:
-        # Validate all paths
-        for variant in variants:
-            variant["outputPath"] = _validate_path(variant["outputPath"])
-            Path(variant["outputPath"]).parent.mkdir(parents=True, exist_ok=True)
-
-        command = createCommand("exportVariants", {
-            "variants": variants,
-            "parallel": parallel
-        })
+        # Validate all paths concurrently
+        variants = list(await asyncio.gather(
+            *[asyncio.to_thread(_prep_variant, v) for v in variants]
+        ))
+
+        # Create each distinct output directory once
+        parents = {os.path.dirname(v["outputPath"]) for v in variants}
+        await asyncio.gather(
+            *[asyncio.to_thread(os.makedirs, parent, exist_ok=True) for parent in parents]
+        )
+
+        ops = [
+            {
+                "tool": "exportPDF",
+                "args": {
+                    "outputPath": variant["outputPath"],
+                    "preset": variant.get("preset", "High Quality Print")
+                }
+            }
+            for variant in variants
+        ]
+
+        # One batch command with an exportPDF op per variant
+        response = await asyncio.to_thread(
+            _send_command, createCommand("batch", {"ops": ops})
+        )
+
+        # Report every variant that failed, not just the first
+        if response.get("status") == "SUCCESS":
+            op_results = (response.get("response") or {}).get("results") or []
+            failed = [
+                {"outputPath": variant["outputPath"], "error": op.get("message", "Unknown error")}
+                for variant, op in zip(variants, op_results)
+                if isinstance(op, dict) and op.get("status", "SUCCESS") != "SUCCESS"
+            ]
+            if failed:
+                response = {
+                    "status": "ERROR",
+                    "message": f"{len(failed)} of {len(variants)} variants failed",
+                    "failed": failed
+                }
+        else:
+            # The batch rolls back as a whole, so every variant failed
+            response = {**response, "failed": [
+                {"outputPath": variant["outputPath"], "error": response.get("message", "Unknown error")}
+                for variant in variants
+            ]}
 
-        response = sendCommand(command)
-        return _handle_response(response, request_id)
+        result = _handle_response(response, request_id)
+
+        if result.get("ok"):
+            result["data"]["exports"] = variants
+
+        return result
 
     except Exception as e:
         return {
@@ -1045,7 +1457,7 @@ def document_snapshot(
     try:
         command = createCommand("documentSnapshot", {})
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -1077,11 +1489,13 @@ def set_units(
         {ok: true} or {ok: false, error: {...}}
     """
     try:
+        _check_literal(units, _UNITS, "units")
+
         command = createCommand("setUnits", {
             "units": units
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -1119,7 +1533,7 @@ def set_styles(
             "object": object or []
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -1151,7 +1565,7 @@ def batch(
             "ops": ops
         })
 
-        response = sendCommand(command)
+        response = _send_command(command)
         return _handle_response(response, request_id)
 
     except Exception as e:
@@ -1163,24 +1577,105 @@ def batch(
             }
         }
 
+@mcp.tool()
+def flush_and_sync() -> dict:
+    """
+    Waits for all queued (await_response=False) commands to finish and
+    reports the ones that failed since the last call.
+
+    Returns:
+        {ok: true, data: {flushed}} or {ok: false, error: {code, msg, details: [errors]}}
+    """
+    global _queued_sent, _queued_failed
+    _flush_outbox()
+
+    # The sender runs one send at a time, and a send's done-callbacks run before
+    # the next one starts, so once this no-op has run every queued send is reported
+    _sender.submit(lambda: None).result()
+
+    with _pending_lock:
+        flushed, failed = _queued_sent, _queued_failed
+        errors = list(_queued_errors)
+        _queued_sent = _queued_failed = 0
+        _queued_errors.clear()
+
+    if failed:
+        return {
+            "ok": False,
+            "error": {
+                "code": "FLUSH_FAILED",
+                "msg": f"{failed} of {flushed} queued sends failed",
+                "details": errors
+            }
+        }
+
+    return {"ok": True, "data": {"flushed": flushed}}
+
+@mcp.tool()
+def tune_batch(
+    min_ms: Optional[float] = None,
+    factor: Optional[float] = None
+) -> dict:
+    """
+    Tunes the fire-and-forget flush interval, max(min_ms, factor * RTT).
+
+    Args:
+        min_ms: Minimum flush interval in milliseconds (default 1)
+        factor: Multiplier applied to the observed round-trip time (default 0.5)
+
+    Returns:
+        {ok: true, data: {minMs, factor, rttMs, intervalMs}}
+    """
+    global _batch_min_ms, _batch_rtt_factor
+    if min_ms is not None:
+        _batch_min_ms = max(0.0, min_ms)
+    if factor is not None:
+        _batch_rtt_factor = max(0.0, factor)
+
+    return {
+        "ok": True,
+        "data": {
+            "minMs": _batch_min_ms,
+            "factor": _batch_rtt_factor,
+            "rttMs": _rtt_ema * 1000.0,
+            "intervalMs": _flush_interval() * 1000.0
+        }
+    }
+
+def _refresh_ping() -> None:
+    """Ping the plugin and cache the reported version"""
+    try:
+        response = _send_now(createCommand("ping", {}))
+        _ping_cache["version"] = response.get("version", "unknown")
+        _ping_cache["ts"] = time.monotonic()
+    finally:
+        _ping_cache["refreshing"] = False
+
 @mcp.tool()
 def ping() -> dict:
     """
-    Health check endpoint.
+    Health check endpoint. The plugin version is cached for PING_CACHE_TTL
+    seconds and refreshed in the background shortly before it expires.
 
     Returns:
         {ok: true, status: "ok", app: "InDesign", transport: "stdio"}
     """
     try:
-        command = createCommand("ping", {})
-        response = sendCommand(command)
+        age = time.monotonic() - _ping_cache["ts"]
+        if age >= PING_CACHE_TTL:
+            _ping_cache["refreshing"] = True
+            _refresh_ping()
+        elif age >= PING_CACHE_TTL * 0.8 and not _ping_cache["refreshing"]:
+            # Serve the cached version while revalidating
+            _ping_cache["refreshing"] = True
+            threading.Thread(target=_refresh_ping, daemon=True).start()
 
         return {
             "ok": True,
             "status": "ok",
             "app": "InDesign",
             "transport": "stdio",
-            "version": response.get("version", "unknown")
+            "version": _ping_cache["version"]
         }
     except Exception as e:
         return {
@@ -1212,7 +1707,7 @@ def get_instructions() -> str:
 
     PRO V2 TOOLS:
     - grid_frame_text: Multi-column text layouts
-    - table_from_csv: Import CSV as table
+    - table_from_csv: Import CSV as table (streamed in row batches)
     - place_svg_chart: Place SVG graphics
     - master_apply: Apply master pages
     - link_replace_all: Batch update links
@@ -1231,11 +1726,15 @@ def get_instructions() -> str:
     - set_units: Set measurement units
     - set_styles: Batch create/update styles
     - batch: Atomic multi-operation execution
+    - flush_and_sync: Wait for queued fire-and-forget commands
+    - tune_batch: Tune the fire-and-forget flush interval
     - ping: Health check
 
     All tools return {ok: true, ...} or {ok: false, error: {...}}
     All paths must be absolute Windows paths.
     Supports idempotency via optional request_id parameter.
+    apply_style, master_apply, link_replace_all and find_replace_text accept
+    await_response=false to queue without waiting; call flush_and_sync after.
     """
 
 if __name__ == "__main__":
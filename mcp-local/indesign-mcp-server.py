@@ -22,6 +22,8 @@
 
 import sys
 import os
+from types import MappingProxyType
+from typing import Optional
 
 # Add the adb-mcp/mcp directory to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'adb-mcp', 'mcp'))
@@ -47,14 +49,18 @@ socket_client.configure(
 
 init(APPLICATION, socket_client)
 
+# Read-only layout defaults shared by every create_document call
+_DEFAULT_COLUMNS = MappingProxyType({"count": 1, "gutter": 12})
+_DEFAULT_MARGINS = MappingProxyType({"top": 36, "bottom": 36, "left": 36, "right": 36})
+
 @mcp.tool()
 def create_document(
    width: int,
    height: int,
    pages: int = 0,
    pages_facing: bool = False,
-   columns: dict = {"count": 1, "gutter": 12},
-   margins: dict = {"top": 36, "bottom": 36, "left": 36, "right": 36}
+   columns: Optional[dict] = None,
+   margins: Optional[dict] = None
 ):
    """
    Creates a new InDesign document with specified dimensions and layout settings.
@@ -83,8 +89,8 @@ def create_document(
        "intent": "WEB_INTENT",
        "pageWidth": width,
        "pageHeight": height,
-       "margins": margins,
-       "columns": columns,
+       "margins": dict(margins or _DEFAULT_MARGINS),
+       "columns": dict(columns or _DEFAULT_COLUMNS),
        "pagesPerDocument": pages,
        "pagesFacing": pages_facing
    })
@@ -8,9 +8,9 @@ if (-not (Test-Path ".\.venv")) {
 }
 
 # Install dependencies
-Write-Host "Installing dependencies (FastAPI, uvicorn, websockets, httpx)..." -ForegroundColor Yellow
-.\.venv\Scripts\pip install fastapi uvicorn websockets httpx --quiet --disable-pip-version-check
+Write-Host "Installing dependencies (FastAPI, uvicorn, httptools, websockets, httpx)..." -ForegroundColor Yellow
+.\.venv\Scripts\pip install fastapi uvicorn httptools websockets httpx --quiet --disable-pip-version-check
 
 Write-Host "`n✅ Installation complete!" -ForegroundColor Green
 Write-Host "`nTo start the bridge:" -ForegroundColor Cyan
-Write-Host "  .\.venv\Scripts\uvicorn mcp_http_bridge:app --host 127.0.0.1 --port 8012" -ForegroundColor White
+Write-Host "  .\.venv\Scripts\uvicorn mcp_http_bridge:app --host 127.0.0.1 --port 8012 --timeout-keep-alive 75" -ForegroundColor White
@@ -1,17 +1,55 @@
 # mcp_http_bridge.py
 # HTTP → WS bridge for MCP. Listens on 8012 and forwards commands to ws://localhost:8013/{application}
-import asyncio, json, uuid
+import asyncio, json, os, secrets
 from typing import List, Optional, Dict, Any
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 import websockets
+from websockets.protocol import State
 import httpx
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 PROXY_URL = "http://127.0.0.1:8013/health"  # proxy health
 WS_BASE   = "ws://127.0.0.1:8013"           # proxy websocket base
 
 app = FastAPI(title="MCP HTTP Bridge", version="0.1")
 
+APPLICATIONS = ("indesign", "illustrator")
+
+def _dumps(obj: Any) -> str:
+    # Text, not bytes, so the proxy still receives text frames
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+def _loads(raw: Any) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Shared keep-alive client for proxy health checks, opened at startup
+_http: Optional[httpx.AsyncClient] = None
+
+# Constant command envelope per application, serialized once without its closing brace
+_ENVELOPES = {app: _dumps({"type": "COMMAND", "application": app})[:-1] for app in APPLICATIONS}
+
+# POOL_SIZE pre-connected WS clients per application; a slot holds None until connected.
+# Every connection sends its own INIT registration. The proxy (adb-mcp, not in this
+# tree) is only known to handle one registration per application, so the default is a
+# single connection. Raise MCP_BRIDGE_POOL_SIZE only for a proxy that routes responses
+# by connection rather than by the application's latest registration.
+POOL_SIZE = max(1, int(os.environ.get("MCP_BRIDGE_POOL_SIZE", "1")))
+_ws_pools: Dict[str, asyncio.Queue] = {}
+# Outstanding commands per connection, keyed by message id, resolved by _recv_loop
+_ws_pending: Dict[Any, Dict[str, asyncio.Future]] = {}
+# Strong references to running _recv_loop tasks; the event loop only keeps weak ones
+_recv_tasks = set()
+
 class Step(BaseModel):
     command: str
     params: Dict[str, Any] = Field(default_factory=dict)
@@ -26,40 +64,122 @@ class JobTicket(BaseModel):
 async def health():
     ok = False
     try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            r = await client.get(PROXY_URL)
-            ok = r.status_code == 200 and "ok" in r.text.lower()
+        r = await _http.get(PROXY_URL)
+        ok = r.status_code == 200 and "ok" in r.text.lower()
     except Exception:
         ok = False
     return {"status": "ok" if ok else "degraded", "proxy8013": ok}
 
 async def _send_ws_command(ws, application: str, command: str, params: Dict[str, Any], timeout: int):
-    msg_id = f"cmd-{uuid.uuid4()}"
-    payload = {
-        "id": msg_id,
-        "type": "COMMAND",
-        "application": application,
-        "command": command,
-        "params": params or {}
-    }
-    await ws.send(json.dumps(payload))
-
-    # Wait for matching response
-    while True:
-        raw = await asyncio.wait_for(ws.recv(), timeout=timeout)
-        data = json.loads(raw)
-        if data.get("id") == msg_id and data.get("type") in ("RESPONSE", "ERROR"):
-            return data
+    msg_id = f"cmd-{secrets.token_hex(8)}"
+    tail = _dumps({"id": msg_id, "command": command, "params": params or {}})
+    pending = _ws_pending.get(ws)
+    if pending is None:
+        raise ConnectionError("WS reader stopped")
+    fut = asyncio.get_running_loop().create_future()
+    pending[msg_id] = fut
+    try:
+        await ws.send(f"{_ENVELOPES[application]},{tail[1:]}")
+        # _recv_loop resolves the future when the matching response arrives
+        return await asyncio.wait_for(fut, timeout=timeout)
+    finally:
+        pending.pop(msg_id, None)
+
+async def _recv_loop(ws, pending: Dict[str, asyncio.Future]):
+    """Read frames off a connection and route responses to their waiting futures"""
+    try:
+        async for raw in ws:
+            # A malformed frame is dropped; it must not take the reader down with it
+            try:
+                data = _loads(raw)
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            if data.get("type") in ("RESPONSE", "ERROR"):
+                fut = pending.pop(data.get("id"), None)
+                if fut and not fut.done():
+                    fut.set_result(data)
+    except websockets.ConnectionClosed:
+        pass
+    except Exception as e:
+        print(f"[Bridge] WS reader stopped: {e}")
+    finally:
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(ConnectionError("WS connection closed"))
+        pending.clear()
+        _ws_pending.pop(ws, None)
+        # Without a reader the connection is useless; close it so the pool reconnects the slot
+        await ws.close()
+
+async def _connect_ws(application: str):
+    # Localhost traffic: permessage-deflate only costs CPU. _recv_loop drains
+    # frames continuously, so the incoming queue can be unbounded.
+    ws = await websockets.connect(
+        f"{WS_BASE}/{application}",
+        max_size=16_000_000,
+        ping_timeout=30,
+        compression=None,
+        max_queue=None,
+        write_limit=2**20,
+    )
+    # Handshake
+    init = {"type": "INIT", "application": application, "version": "2024"}
+    await ws.send(_dumps(init))
+    pending = _ws_pending[ws] = {}
+    task = asyncio.create_task(_recv_loop(ws, pending))
+    _recv_tasks.add(task)
+    task.add_done_callback(_recv_tasks.discard)
+    return ws
+
+async def _acquire_ws(application: str):
+    """Take a connection from the application's pool, (re)connecting its slot if needed"""
+    pool = _ws_pools[application]
+    ws = await pool.get()
+    if ws is None or ws.state is not State.OPEN or ws not in _ws_pending:
+        try:
+            ws = await _connect_ws(application)
+        except Exception:
+            pool.put_nowait(None)
+            raise
+    return ws
+
+@app.on_event("startup")
+async def _startup():
+    global _http
+    _http = httpx.AsyncClient(
+        timeout=2.0,
+        limits=httpx.Limits(max_connections=1, max_keepalive_connections=1)
+    )
+    for application in APPLICATIONS:
+        pool = _ws_pools[application] = asyncio.Queue()
+        conns = await asyncio.gather(
+            *[_connect_ws(application) for _ in range(POOL_SIZE)], return_exceptions=True
+        )
+        failed = [c for c in conns if isinstance(c, Exception)]
+        if failed:
+            print(f"[Bridge] {application}: {len(failed)}/{POOL_SIZE} WS connections not available at startup: {failed[0]}")
+        for c in conns:
+            pool.put_nowait(None if isinstance(c, Exception) else c)
+
+@app.on_event("shutdown")
+async def _shutdown():
+    for pool in _ws_pools.values():
+        while not pool.empty():
+            ws = pool.get_nowait()
+            if ws is not None:
+                await ws.close()
+    if _http is not None:
+        await _http.aclose()
 
 @app.post("/api/jobs")
 async def run_job(ticket: JobTicket):
-    # Serialize execution per request with a fresh connection
-    url = f"{WS_BASE}/{ticket.application}"
+    # Each job runs on its own pooled connection, so up to POOL_SIZE jobs
+    # per application execute concurrently (one at a time with the default pool)
     try:
-        async with websockets.connect(url, max_size=16_000_000, ping_timeout=30) as ws:
-            # Handshake
-            init = {"type": "INIT", "application": ticket.application, "version": "2024"}
-            await ws.send(json.dumps(init))
+        ws = await _acquire_ws(ticket.application)
+        try:
             results = []
             for s in ticket.steps:
                 res = await _send_ws_command(ws, ticket.application, s.command, s.params, ticket.timeoutSec)
@@ -67,6 +187,8 @@ async def run_job(ticket: JobTicket):
                     raise HTTPException(status_code=502, detail={"step": s.command, "error": res})
                 results.append(res)
             return {"status": "ok", "results": results}
+        finally:
+            _ws_pools[ticket.application].put_nowait(ws)
     except HTTPException:
         raise
     except Exception as e:
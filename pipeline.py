@@ -10,40 +10,369 @@ import sys
 import io
 
 # Set UTF-8 encoding for stdout/stderr (fixes emoji issues on Windows)
+# reconfigure() keeps the existing streams, so redirection and capture still work
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    for _stream in (sys.stdout, sys.stderr):
+        if hasattr(_stream, 'reconfigure'):
+            _stream.reconfigure(encoding='utf-8', errors='replace')
 import time
 import json
+import re
+import copy
+import asyncio
 import argparse
+import functools
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# requests and DocumentValidator are imported on first use so CLI startup
+# (e.g. --help) doesn't pay for them
+_SESSION = None
+
+
+def _http_session():
+    """Keep-alive session shared by every outbound HTTP call, with retries on transient failures"""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def __getattr__(name):
+    """PEP 562 hook: keep pipeline.DocumentValidator importable without loading it eagerly"""
+    if name == "DocumentValidator":
+        from validate_document import DocumentValidator
+        globals()["DocumentValidator"] = DocumentValidator
+        return DocumentValidator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Add InDesign automation modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'adb-mcp', 'mcp'))
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_CHECK_COLORS_JS = os.path.join(_MODULE_DIR, "check_colors.js")
+
+sys.path.insert(0, os.path.join(_MODULE_DIR, 'adb-mcp', 'mcp'))
 
 from core import init, sendCommand, createCommand
 import socket_client
-from validate_document import DocumentValidator
+
+_GRAPH_OUTPUT_RE = re.compile(r'\[Graph\] Generated: (.+\.json)')
+_VISUAL_DIFF_RE = re.compile(r"Diff ([\d.]+)%")
+
+ICON_OK = "[OK]"
+ICON_FAIL = "[FAIL]"
+
+
+def _read_json(path: str) -> Any:
+    """Load a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    """Parse a JSON file once per (path, mtime); shared, so never hand it out directly"""
+    return _read_json(path)
+
+
+def _load_json(path: str) -> Any:
+    """Memoized load of a config/job JSON file; each caller gets its own deep copy"""
+    return copy.deepcopy(_load_json_cached(path, os.stat(path).st_mtime_ns))
+
+
+async def _run_proc(argv: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """Run a subprocess on the event loop, collecting decoded stdout/stderr like subprocess.run"""
+    proc = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(argv, timeout)
+
+    return subprocess.CompletedProcess(
+        argv, proc.returncode,
+        stdout.decode('utf-8', errors='replace'),
+        stderr.decode('utf-8', errors='replace')
+    )
+
+
+def _run_proc_sync(argv: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """Blocking boundary for _run_proc; safe to call from worker threads (each gets its own loop)"""
+    return asyncio.run(_run_proc(argv, timeout))
+
+
+def _search_proc_output(argv: List[str], pattern: "re.Pattern", timeout: float) -> Tuple[int, Optional["re.Match"], str]:
+    """Run a subprocess, streaming stdout line by line until pattern matches instead of buffering it all.
+
+    Lines after the match are drained and discarded. Returns (returncode, match, stderr) and raises
+    subprocess.TimeoutExpired if the process outlives timeout.
+    """
+    # stderr goes to a temp file, not a pipe: nobody reads it until stdout hits EOF, and a
+    # child that filled a stderr pipe would block until the timeout killed it
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        argv, stdout=subprocess.PIPE, stderr=stderr_file,
+        text=True, encoding='utf-8', errors='replace', bufsize=1
+    )
+    # Reading stdout blocks, so the deadline is enforced by killing the process from a timer
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        proc.kill()
+
+    killer = threading.Timer(timeout, _kill)
+    killer.start()
+    try:
+        match = None
+        for line in proc.stdout:
+            if match is None:
+                match = pattern.search(line)
+        returncode = proc.wait()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode('utf-8', errors='replace')
+    finally:
+        killer.cancel()
+        proc.stdout.close()
+        stderr_file.close()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(argv, timeout)
+    return returncode, match, stderr
+
+
+def _send_isolated(command: Dict) -> Dict:
+    """sendCommand, with a raised error turned into a failed response"""
+    try:
+        return sendCommand(command)
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+
+# Error messages meaning the batch command itself was refused, so none of its ops ran
+_BATCH_REJECTED_RE = re.compile(r"unknown (command|action|tool)|not (supported|implemented)", re.IGNORECASE)
+
+
+def _batch_rejected(response: Dict) -> bool:
+    """True if the batch command was rejected outright rather than run"""
+    return response.get("status") != "SUCCESS" and bool(_BATCH_REJECTED_RE.search(str(response.get("message", ""))))
+
+
+def _batch_op_responses(response: Dict, count: int) -> List[Dict]:
+    """One response per op from a batch response; every op fails if the batch failed or its results don't line up"""
+    if response.get("status") != "SUCCESS":
+        return [{"status": "ERROR", "message": response.get("message", "Batch failed")}] * count
+    results = (response.get("response") or {}).get("results")
+    if not isinstance(results, list) or len(results) != count:
+        # The ops may well have run; resending them could run every export twice
+        failed = {"status": "ERROR", "message": "Batch response did not report one result per op"}
+        return [failed] * count
+    # Ops may report a full {status, ...} response or just their payload
+    return [
+        r if isinstance(r, dict) and "status" in r else {"status": "SUCCESS", "response": r}
+        for r in results
+    ]
+
+
+def _scorecard_path(report_path: str) -> str:
+    """Scorecard JSON written next to a .txt report: <stem>-scorecard.json"""
+    p = Path(report_path)
+    return str(p.with_name(p.stem + '-scorecard.json'))
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write bytes to a temp file and os.replace it over path, so readers never see a partial file"""
+    # A unique temp name per write, so concurrent writers of one report can't clobber each other
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                    suffix='.tmp', delete=False)
+    try:
+        with f:
+            f.write(data)
+            if hasattr(os, 'posix_fadvise'):
+                # Reports are write-once; keep them from crowding the page cache in CI
+                f.flush()
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        # NamedTemporaryFile creates files 0600; reports keep the usual readable mode
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+
+def _write_json(obj: Any, path: str):
+    """Atomically write indented JSON to a file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    else:
+        data = json.dumps(obj, indent=2, default=str).encode('utf-8')
+    _atomic_write(path, data)
+
+
+# In-process only: a persistent store would need eviction, locking between
+# concurrent runs and a validator version in its key to stay correct
+@functools.lru_cache(maxsize=32)
+def _validate_pdf_cached(pdf_path: str, mtime_ns: int, size: int, parallelism: int = 1) -> Dict:
+    """Run DocumentValidator once per file revision (path, mtime_ns, size) in this process"""
+    from validate_document import DocumentValidator
+    return DocumentValidator(pdf_path, parallelism=parallelism).validate_all()
+
+
+@dataclass
+class PipelineStep:
+    """A node in the pipeline DAG. fn reads/writes the shared context and returns success."""
+    name: str
+    fn: Callable[[Dict[str, Any]], bool]
+    deps: List[str] = field(default_factory=list)
+    required: bool = True  # A failed required step stops the run
+
+
+@dataclass(slots=True)
+class Step:
+    """A logged pipeline step. Kept lean on the hot path; to_dict() builds the report form."""
+    name: str
+    success: bool
+    ts_ns: int
+    duration_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    details: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        step = {
+            "name": self.name,
+            "success": self.success,
+            "timestamp": datetime.fromtimestamp(self.ts_ns / 1e9).isoformat(),
+            "duration_seconds": self.duration_seconds,
+            "elapsed_seconds": self.elapsed_seconds
+        }
+        if self.details is not None:
+            step["details"] = self.details
+        if self.error is not None:
+            step["error"] = self.error
+        return step
+
+
+def topological_stages(steps: List[PipelineStep]) -> List[List[PipelineStep]]:
+    """Group steps into stages (Kahn's algorithm); steps within a stage are independent"""
+    by_name = {step.name: step for step in steps}
+    indegree = {step.name: 0 for step in steps}
+    dependents: Dict[str, List[str]] = {step.name: [] for step in steps}
+
+    for step in steps:
+        for dep in step.deps:
+            if dep not in by_name:
+                raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+            indegree[step.name] += 1
+            dependents[dep].append(step.name)
+
+    ready = deque(name for name, degree in indegree.items() if degree == 0)
+    stages = []
+    seen = 0
+    while ready:
+        stage = list(ready)
+        ready.clear()
+        stages.append([by_name[name] for name in stage])
+        seen += len(stage)
+        for name in stage:
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+    if seen != len(steps):
+        raise ValueError("Pipeline steps contain a dependency cycle")
+
+    return stages
+
 
 class InDesignPipeline:
     """Automated pipeline for InDesign document processing"""
 
+    MCP_CACHE_TTL = 5.0  # Seconds a memoized readDocumentInfo/color check stays valid
+
     def __init__(self, config_path: str = None):
         self.config = self.load_config(config_path)
         self.APPLICATION = "indesign"
         self.PROXY_URL = self.config.get("proxy_url", "http://localhost:8013")
         self.connected = False
         self.start_time = time.time()
+        # Monotonic clock for step timings: per-step delta plus elapsed since start
+        self._t0 = time.perf_counter()
+        self._last_step_time = self._t0
         self.step_timings = {}
+        self._log_lock = threading.Lock()  # log_step may run from export worker threads
+        # Memoized read-only MCP results: key -> (monotonic time stored, value)
+        self._mcp_cache: Dict[tuple, Tuple[float, Any]] = {}
+        self._doc_info: Optional[Dict] = None
+        # (configured export_path, created Path) - mkdir runs once per configured path
+        self._export_dir: Optional[Tuple[str, Path]] = None
+        self._export_dir_lock = threading.Lock()
+        # Commands queued for one batched round-trip, drained by _flush()
+        self._submit_queue: List[Dict] = []
+        # Prebuilt argument-free commands, created in connect() once init() has run
+        self._ping_cmd: Optional[Dict] = None
+        self._read_doc_info_cmd: Optional[Dict] = None
+        self._validate_colors_cmd: Optional[Dict] = None
+        # Helper script/report paths resolved (and stat'ed) once per pipeline
+        self._paths: Dict[str, str] = {
+            "quality_js": os.path.join(_MODULE_DIR, 'scripts', 'validate-pdf-quality.js'),
+            "visual_js": os.path.join(_MODULE_DIR, 'scripts', 'compare-pdf-visual.js'),
+            "gemini_js": os.path.join(_MODULE_DIR, 'scripts', 'gemini-vision-review.js'),
+            "baseline_js": os.path.join(_MODULE_DIR, 'scripts', 'create-reference-screenshots.js'),
+            "approval_js": os.path.join(_MODULE_DIR, 'approval', 'approval-manager.js'),
+            "graph_py": os.path.join(_MODULE_DIR, 'reports', 'graphs', 'generate-job-graph.py'),
+            "reports_dir": os.path.join(_MODULE_DIR, 'reports', 'pipeline'),
+        }
+        self._paths_exist: Dict[str, bool] = {k: os.path.exists(p) for k, p in self._paths.items()}
+        if self.config.get("validation_parallelism", 1) > 1:
+            # Create the page-extraction pool here, before any DAG worker threads exist
+            from validate_document import get_page_pool
+            get_page_pool(self.config["validation_parallelism"])
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "steps": [],
             "success": False,
             "score": 0
         }
+        self._append_step = self.results["steps"].append
 
     def load_config(self, config_path: str = None) -> Dict:
         """Load pipeline configuration"""
@@ -55,14 +384,14 @@ class InDesignPipeline:
             "auto_fix_colors": True,
             "auto_fix_missing_assets": False,
             "export_formats": ["pdf", "png"],
+            # Worker processes for per-page PDF checks; opt in with a value > 1
+            "validation_parallelism": 1,
             "notification_webhook": None,
             "ci_mode": False
         }
 
         if config_path and os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                user_config = json.load(f)
-                default_config.update(user_config)
+            default_config.update(_load_json(config_path))
 
         return default_config
 
@@ -71,10 +400,9 @@ class InDesignPipeline:
         if not job_config_path or not os.path.exists(job_config_path):
             return {}
 
-        with open(job_config_path, 'r') as f:
-            job = json.load(f)
+        job = _load_json(job_config_path)
 
-        qa_profile = job.get('qaProfile', {})
+        qa_profile = dict(job.get('qaProfile', {}))
 
         # Override with CLI args if present
         if self.config.get('validation_threshold'):
@@ -96,7 +424,16 @@ class InDesignPipeline:
             )
             init(self.APPLICATION, socket_client)
 
-            response = sendCommand(createCommand("ping", {}))
+            # createCommand stamps the application registered by init(), so the
+            # argument-free commands are built once here and reused by every call
+            self._ping_cmd = createCommand("ping", {})
+            self._read_doc_info_cmd = createCommand("readDocumentInfo", {})
+            self._validate_colors_cmd = createCommand("runScript", {
+                "scriptPath": _CHECK_COLORS_JS,
+                "scriptFunction": "validateColors"
+            })
+
+            response = sendCommand(self._ping_cmd)
             self.connected = response.get("status") == "SUCCESS"
 
             self.log_step("Connect to InDesign", self.connected)
@@ -112,9 +449,16 @@ class InDesignPipeline:
             return {"status": "error", "message": "Not connected"}
 
         try:
-            response = sendCommand(createCommand("readDocumentInfo", {}))
+            doc_info = self._cache_get(("readDocumentInfo",))
+            if doc_info is not None:
+                self.log_step("Check Document", True, doc_info)
+                return doc_info
+
+            response = sendCommand(self._read_doc_info_cmd)
             if response.get("status") == "SUCCESS":
                 doc_info = response.get("response", {})
+                self._doc_info = doc_info
+                self._cache_put(("readDocumentInfo",), doc_info)
                 self.log_step("Check Document", True, doc_info)
                 return doc_info
             else:
@@ -125,22 +469,42 @@ class InDesignPipeline:
             self.log_step("Check Document", False, str(e))
             return {"status": "error", "message": str(e)}
 
+    def _cache_get(self, key: tuple) -> Any:
+        """Return a memoized MCP result, or None if missing or older than MCP_CACHE_TTL"""
+        entry = self._mcp_cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.MCP_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def _cache_put(self, key: tuple, value: Any):
+        self._mcp_cache[key] = (time.monotonic(), value)
+
+    def _color_cache_key(self) -> Optional[tuple]:
+        """Key color results on the document revision, if one is known"""
+        if not self._doc_info:
+            return None
+        return ("validateColors", self._doc_info.get("name"), self._doc_info.get("modificationDate"))
+
     def validate_colors(self) -> Tuple[bool, List[str]]:
         """Validate document colors"""
+        cache_key = self._color_cache_key()
+        cached = self._cache_get(cache_key) if cache_key else None
+        if cached is not None:
+            missing_colors = cached
+            self.log_step("Validate Colors",
+                        len(missing_colors) == 0,
+                        f"Missing: {missing_colors}" if missing_colors else "All colors present")
+            return len(missing_colors) == 0, missing_colors
+
         try:
             # Run color validation script
-            script_path = os.path.join(os.path.dirname(__file__), "check_colors.js")
-
-            command = createCommand("runScript", {
-                "scriptPath": script_path,
-                "scriptFunction": "validateColors"
-            })
-
-            response = sendCommand(command)
+            response = sendCommand(self._validate_colors_cmd)
 
             if response.get("status") == "SUCCESS":
                 validation = response.get("response", {})
                 missing_colors = validation.get("missingColors", [])
+                if cache_key:
+                    self._cache_put(cache_key, missing_colors)
 
                 self.log_step("Validate Colors",
                             len(missing_colors) == 0,
@@ -155,10 +519,14 @@ class InDesignPipeline:
             self.log_step("Validate Colors", False, str(e))
             return False, []
 
-    def fix_missing_colors(self, missing_colors: List[str]) -> bool:
-        """Automatically fix missing colors"""
+    def fix_missing_colors(self, missing_colors: List[str]) -> Tuple[bool, Optional[List[str]]]:
+        """Automatically fix missing colors
+
+        Returns (success, post_fix_missing). post_fix_missing is the missingColors list the
+        apply script reports after applying, or None if the plugin doesn't report it.
+        """
         if not self.config.get("auto_fix_colors", True):
-            return False
+            return False, None
 
         try:
             # Apply colors using ExtendScript workaround
@@ -168,47 +536,73 @@ class InDesignPipeline:
 
             response = sendCommand(command)
             success = response.get("status") == "SUCCESS"
+            post_fix_missing = None
+
+            if success:
+                # The document changed; drop memoized document info and color checks
+                self._mcp_cache.clear()
+                result = response.get("response")
+                if isinstance(result, dict) and "missingColors" in result:
+                    post_fix_missing = result["missingColors"]
 
             self.log_step("Fix Missing Colors", success,
                         f"Fixed {len(missing_colors)} colors" if success else "Failed to fix colors")
 
-            return success
+            return success, post_fix_missing
 
         except Exception as e:
             self.log_step("Fix Missing Colors", False, str(e))
-            return False
+            return False, None
+
+    def _ensure_export_dir(self) -> Path:
+        """Return the export directory, creating it only the first time a path is seen"""
+        export_path = self.config["export_path"]
+        with self._export_dir_lock:
+            if self._export_dir is None or self._export_dir[0] != export_path:
+                export_dir = Path(export_path)
+                export_dir.mkdir(parents=True, exist_ok=True)
+                self._export_dir = (export_path, export_dir)
+            return self._export_dir[1]
+
+    def _build_export_command(self, format: str) -> Optional[Tuple[str, Dict]]:
+        """Return (export_path, command) for a format, or None if unsupported"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        export_dir = self._ensure_export_dir()
 
-    def export_document(self, format: str = "pdf") -> Optional[str]:
-        """Export document to specified format"""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir = Path(self.config["export_path"])
-            export_dir.mkdir(parents=True, exist_ok=True)
+        if format == "pdf":
+            filename = f"export_{timestamp}.pdf"
+            export_path = str(export_dir / filename)
 
-            if format == "pdf":
-                filename = f"export_{timestamp}.pdf"
-                export_path = str(export_dir / filename)
+            command = createCommand("exportPDF", {
+                "outputPath": export_path,
+                "preset": self.config["pdf_preset"],
+                "viewPDF": False
+            })
 
-                command = createCommand("exportPDF", {
-                    "outputPath": export_path,
-                    "preset": self.config["pdf_preset"],
-                    "viewPDF": False
-                })
+        elif format == "png":
+            filename = f"export_{timestamp}.png"
+            export_path = str(export_dir / filename)
 
-            elif format == "png":
-                filename = f"export_{timestamp}.png"
-                export_path = str(export_dir / filename)
+            command = createCommand("exportPNG", {
+                "outputPath": export_path,
+                "resolution": 300,
+                "quality": "maximum"
+            })
+
+        else:
+            return None
 
-                command = createCommand("exportPNG", {
-                    "outputPath": export_path,
-                    "resolution": 300,
-                    "quality": "maximum"
-                })
+        return export_path, command
 
-            else:
+    def export_document(self, format: str = "pdf") -> Optional[str]:
+        """Export document to specified format"""
+        try:
+            built = self._build_export_command(format)
+            if not built:
                 self.log_step(f"Export {format.upper()}", False, "Unsupported format")
                 return None
 
+            export_path, command = built
             response = sendCommand(command)
 
             if response.get("status") == "SUCCESS":
@@ -222,11 +616,71 @@ class InDesignPipeline:
             self.log_step(f"Export {format.upper()}", False, str(e))
             return None
 
+    def export_documents(self, formats: List[str]) -> List[str]:
+        """Export several formats with a single batched MCP round-trip; returns the paths that succeeded"""
+        exports = []
+        first = len(self._submit_queue)
+        for format in formats:
+            try:
+                built = self._build_export_command(format)
+            except Exception as e:
+                self.log_step(f"Export {format.upper()}", False, str(e))
+                continue
+            if not built:
+                self.log_step(f"Export {format.upper()}", False, "Unsupported format")
+                continue
+            export_path, command = built
+            self._enqueue(command)
+            exports.append((format, export_path))
+
+        # Each format is judged on its own response, so a failed PNG still leaves a good PDF
+        responses = self._flush()[first:]
+        exported = []
+        for (format, export_path), response in zip(exports, responses):
+            if response.get("status") == "SUCCESS":
+                self.log_step(f"Export {format.upper()}", True, export_path)
+                exported.append(export_path)
+            else:
+                self.log_step(f"Export {format.upper()}", False, response.get("message"))
+
+        return exported
+
+    def _enqueue(self, command: Dict):
+        """Queue a command for the next _flush()"""
+        self._submit_queue.append(command)
+
+    def _flush(self) -> List[Dict]:
+        """Send queued commands in one round-trip; returns one response per command, in order
+
+        Several commands go out as a batch command ({"ops": [{tool, args}]}, as documented by
+        the MCP server's batch tool) and each op's response is read from response["results"].
+        Commands are resent one by one only if the batch command was rejected outright; a
+        batch that failed, was lost in transit or answered oddly may have run, so its ops are
+        reported as failed rather than run a second time.
+        """
+        if not self._submit_queue:
+            return []
+
+        commands, self._submit_queue = self._submit_queue, []
+        if len(commands) == 1:
+            return [_send_isolated(commands[0])]
+
+        response = _send_isolated(createCommand("batch", {
+            "ops": [{"tool": c["action"], "args": c["options"]} for c in commands]
+        }))
+        if _batch_rejected(response):
+            return [_send_isolated(command) for command in commands]
+        return _batch_op_responses(response, len(commands))
+
     def validate_pdf(self, pdf_path: str) -> Dict:
         """Run comprehensive PDF validation"""
         try:
-            validator = DocumentValidator(pdf_path)
-            report = validator.validate_all()
+            st = os.stat(pdf_path)
+            # Copy so callers can annotate the report without touching the cached one
+            report = copy.deepcopy(_validate_pdf_cached(
+                os.path.abspath(pdf_path), st.st_mtime_ns, st.st_size,
+                self.config.get("validation_parallelism", 1)
+            ))
 
             score = report.get("score", 0)
             threshold = self.config["validation_threshold"]
@@ -245,52 +699,47 @@ class InDesignPipeline:
 
     def generate_report(self) -> str:
         """Generate pipeline execution report"""
-        report_lines = [
-            "=" * 60,
-            "PIPELINE EXECUTION REPORT",
-            "=" * 60,
-            f"Timestamp: {self.results['timestamp']}",
-            f"Config: {self.config.get('ci_mode', False) and 'CI Mode' or 'Interactive Mode'}",
-            "",
-            "EXECUTION STEPS:",
-            "-" * 60
-        ]
-
-        for i, step in enumerate(self.results['steps'], 1):
-            status_icon = "[OK]" if step['success'] else "[FAIL]"
-            report_lines.append(f"{i}. {status_icon} {step['name']}")
-            if step.get('details'):
-                report_lines.append(f"   Details: {step['details']}")
-            if not step['success'] and step.get('error'):
-                report_lines.append(f"   Error: {step['error']}")
-
-        report_lines.extend([
-            "",
-            "=" * 60,
-            f"FINAL SCORE: {self.results.get('score', 0)}/100",
-            f"STATUS: {'PASSED' if self.results['success'] else 'FAILED'}",
-            "=" * 60
-        ])
-
-        return "\n".join(report_lines)
+        buf = io.StringIO()
+        w = buf.write
+        rule = "=" * 60
+
+        w(rule); w("\nPIPELINE EXECUTION REPORT\n"); w(rule)
+        w("\nTimestamp: "); w(str(self.results['timestamp']))
+        w("\nConfig: "); w(self.config.get('ci_mode', False) and 'CI Mode' or 'Interactive Mode')
+        w("\n\nEXECUTION STEPS:\n"); w("-" * 60)
+
+        # One formatted line per step, joined in a single pass
+        w("".join([
+            f"\n{i}. {ICON_OK if step.success else ICON_FAIL} {step.name}"
+            + (f"\n   Details: {step.details}" if step.details else "")
+            + (f"\n   Error: {step.error}" if not step.success and step.error else "")
+            for i, step in enumerate(self.results['steps'], 1)
+        ]))
+
+        w("\n\n"); w(rule)
+        w("\nFINAL SCORE: "); w(str(self.results.get('score', 0))); w("/100")
+        w("\nSTATUS: "); w('PASSED' if self.results['success'] else 'FAILED')
+        w("\n"); w(rule)
+
+        return buf.getvalue()
 
     def save_report(self, report: str, path: str = None) -> str:
         """Save report to file"""
         if not path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             job_id = self.config.get("job_id", "unknown")
-            reports_dir = os.path.join(os.path.dirname(__file__), 'reports', 'pipeline')
-            os.makedirs(reports_dir, exist_ok=True)
+            reports_dir = self._paths["reports_dir"]
+            if not self._paths_exist["reports_dir"]:
+                os.makedirs(reports_dir, exist_ok=True)
+                self._paths_exist["reports_dir"] = True
             path = os.path.join(reports_dir, f"pipeline_report_{job_id}_{timestamp}.txt")
 
-        with open(path, 'w') as f:
-            f.write(report)
+        _atomic_write(path, report.encode('utf-8'))
 
         # NEW: Generate QA scorecard JSON
-        scorecard_path = path.replace('.txt', '-scorecard.json')
+        scorecard_path = _scorecard_path(path)
         scorecard = self._generate_scorecard()
-        with open(scorecard_path, 'w') as f:
-            json.dump(scorecard, f, indent=2, default=str)
+        _write_json(scorecard, scorecard_path)
 
         print(f"📊 Scorecard JSON: {scorecard_path}")
 
@@ -301,14 +750,12 @@ class InDesignPipeline:
                 graph_start_time = time.time()
 
                 # Run graph generation script
-                import subprocess
-                graph_script = os.path.join(os.path.dirname(__file__), 'reports', 'graphs', 'generate-job-graph.py')
+                graph_script = self._paths["graph_py"]
 
                 # Call generation script (it will save with its own naming convention)
-                result = subprocess.run(
+                returncode, match, stderr = _search_proc_output(
                     [sys.executable, graph_script, job_config_path, scorecard_path],
-                    capture_output=True,
-                    text=True,
+                    _GRAPH_OUTPUT_RE,
                     timeout=30
                 )
 
@@ -318,18 +765,16 @@ class InDesignPipeline:
                 if "metrics" not in self.results:
                     self.results["metrics"] = {}
 
-                if result.returncode == 0:
-                    # Parse the output to find the generated file path
-                    import re
-                    match = re.search(r'\[Graph\] Generated: (.+\.json)', result.stdout)
+                if returncode == 0:
+                    # Generated file path parsed from the streamed output
                     graph_path = match.group(1) if match else "unknown location"
 
                     print(f"📈 Job graph generated in {graph_duration:.2f}s: {graph_path}")
                     self.results["metrics"]["graph_generation_seconds"] = graph_duration
                 else:
-                    print(f"⚠️ Graph generation failed (non-blocking): {result.stderr}")
+                    print(f"⚠️ Graph generation failed (non-blocking): {stderr}")
                     self.results["metrics"]["graph_generation_seconds"] = graph_duration
-                    self.results["metrics"]["graph_generation_error"] = result.stderr
+                    self.results["metrics"]["graph_generation_error"] = stderr
 
             except subprocess.TimeoutExpired:
                 if "metrics" not in self.results:
@@ -343,38 +788,43 @@ class InDesignPipeline:
                 self.results["metrics"]["graph_generation_error"] = str(e)
 
         # Save full JSON version (after graph generation so metrics are included)
-        json_path = path.replace('.txt', '.json')
-        with open(json_path, 'w') as f:
-            json.dump(self.results, f, indent=2, default=str)
+        json_path = str(Path(path).with_suffix('.json'))
+        _write_json(self._results_for_report(), json_path)
 
         return path
 
+    def _results_for_report(self) -> Dict[str, Any]:
+        """Shallow copy of results with Step records materialized as report dicts"""
+        results = dict(self.results)
+        results["steps"] = [step.to_dict() for step in self.results["steps"]]
+        return results
+
     def log_step(self, name: str, success: bool, details: str = None):
         """Log pipeline step with timing"""
-        step_time = time.time()
-        step_duration = step_time - self.start_time
-
-        step = {
-            "name": name,
-            "success": success,
-            "timestamp": datetime.fromtimestamp(step_time).isoformat(),
-            "duration_seconds": step_duration
-        }
+        # ISO "timestamp" is derived from ts_ns at save time (Step.to_dict)
+        step = Step(name, success, time.time_ns())
 
         if details:
             if success:
-                step["details"] = details
+                step.details = details
             else:
-                step["error"] = details
-
-        self.results["steps"].append(step)
-        self.step_timings[name] = step_duration
-
-        # Console output
-        status_icon = "[OK]" if success else "[FAIL]"
-        print(f"{status_icon} {name} ({step_duration:.2f}s)")
-        if details:
-            print(f"   → {details}")
+                step.error = details
+
+        status_icon = ICON_OK if success else ICON_FAIL
+        with self._log_lock:
+            now = time.perf_counter()
+            step_duration = now - self._last_step_time
+            self._last_step_time = now
+            step.duration_seconds = step_duration
+            step.elapsed_seconds = now - self._t0
+            self._append_step(step)
+            self.step_timings[name] = step_duration
+
+            # Console output - one write per step instead of up to two prints
+            line = f"{status_icon} {name} ({step_duration:.2f}s)\n"
+            if details:
+                line += f"   → {details}\n"
+            sys.stdout.write(line)
 
     def notify_webhook(self, report: Dict):
         """Send notification to webhook if configured"""
@@ -383,8 +833,6 @@ class InDesignPipeline:
             return
 
         try:
-            import requests
-
             payload = {
                 "text": f"Pipeline {'✅ Passed' if self.results['success'] else '❌ Failed'}",
                 "score": self.results.get("score", 0),
@@ -393,7 +841,18 @@ class InDesignPipeline:
                 "details": report
             }
 
-            response = requests.post(webhook_url, json=payload, timeout=10)
+            # Serialize once; the adapter's retries resend the same bytes
+            if ORJSON_AVAILABLE:
+                body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                body = json.dumps(payload, default=str).encode('utf-8')
+
+            response = _http_session().post(
+                webhook_url,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                timeout=10
+            )
             response.raise_for_status()
 
             self.log_step("Send Notification", True, "Webhook notified")
@@ -401,6 +860,23 @@ class InDesignPipeline:
         except Exception as e:
             self.log_step("Send Notification", False, str(e))
 
+    def execute_dag(self, steps: List[PipelineStep], context: Dict[str, Any]) -> bool:
+        """Run steps stage by stage, independent steps in parallel; False if a required step fails"""
+        for stage in topological_stages(steps):
+            if len(stage) == 1:
+                outcomes = [stage[0].fn(context)]
+            else:
+                with ThreadPoolExecutor(max_workers=len(stage)) as executor:
+                    outcomes = list(executor.map(lambda step: step.fn(context), stage))
+
+            # Anything a step queued goes out before the next stage depends on it
+            self._flush()
+
+            if any(step.required and not ok for step, ok in zip(stage, outcomes)):
+                return False
+
+        return True
+
     def run(self) -> bool:
         """Execute the complete pipeline"""
         print("\n>>> Starting InDesign Export & Analysis Pipeline")
@@ -410,79 +886,146 @@ class InDesignPipeline:
         if self.config.get("validate_only"):
             return self.run_validation_only()
 
+        # Export must follow the color fix; the QA layers only need the PDF,
+        # so they run side by side before the report
+        qa_steps = ["validate_pdf", "pdf_quality", "visual_regression", "gemini_review"]
+        steps = [
+            PipelineStep("connect", self._step_connect),
+            PipelineStep("document", self._step_check_document, ["connect"]),
+            PipelineStep("colors", self._step_colors, ["document"], required=False),
+            PipelineStep("export", self._step_export, ["colors"]),
+            PipelineStep("validate_pdf", self._step_validate_pdf, ["export"], required=False),
+            PipelineStep("pdf_quality", self._step_pdf_quality, ["export"], required=False),
+            PipelineStep("visual_regression", self._step_visual_regression, ["export"], required=False),
+            PipelineStep("gemini_review", self._step_gemini_review, ["export"], required=False),
+            PipelineStep("report", self._step_report, qa_steps),
+        ]
+
+        if not self.execute_dag(steps, {}):
+            return False
+
+        # Return success for CI/CD integration
+        return self.results["success"]
+
+    def _step_connect(self, context: Dict[str, Any]) -> bool:
         # Step 1: Connect to InDesign
         if not self.connect_to_indesign():
             print("❌ Failed to connect to InDesign. Ensure it's running.")
             return False
+        return True
 
+    def _step_check_document(self, context: Dict[str, Any]) -> bool:
         # Step 2: Check document status
         doc_info = self.check_document_status()
+        context["doc_info"] = doc_info
         if doc_info.get("status") == "error":
             print("❌ No document open or document error")
             return False
+        return True
 
+    def _step_colors(self, context: Dict[str, Any]) -> bool:
         # Step 3: Validate colors
         colors_valid, missing_colors = self.validate_colors()
         if not colors_valid and missing_colors:
             print(f"⚠️  Missing colors detected: {missing_colors}")
             if self.config.get("auto_fix_colors"):
                 print("🔧 Attempting to fix missing colors...")
-                if self.fix_missing_colors(missing_colors):
+                fixed, post_fix_missing = self.fix_missing_colors(missing_colors)
+                if fixed and post_fix_missing is not None:
+                    # The apply script re-checked the swatches in the same round trip
+                    colors_valid = len(post_fix_missing) == 0
+                elif fixed:
                     # Re-validate after fix
                     colors_valid, _ = self.validate_colors()
+        context["colors_valid"] = colors_valid
+        return colors_valid
 
-        # Step 4: Export document(s)
-        exported_files = []
-        for format in self.config.get("export_formats", ["pdf"]):
-            export_path = self.export_document(format)
-            if export_path:
-                exported_files.append(export_path)
-                print(f"📄 Exported: {export_path}")
+    def _step_export(self, context: Dict[str, Any]) -> bool:
+        # Step 4: Export document(s) - all formats go out in one batched round-trip;
+        # a format that fails is logged and the rest still count
+        exported_files = self.export_documents(self.config.get("export_formats", ["pdf"]))
+        for export_path in exported_files:
+            print(f"📄 Exported: {export_path}")
 
         if not exported_files:
             print("❌ No files exported successfully")
             return False
 
-        # Step 5: Validate exported PDF (Layer 1)
         pdf_files = [f for f in exported_files if f.endswith('.pdf')]
-        if pdf_files:
-            pdf_path = pdf_files[0]
-            validation_report = self.validate_pdf(pdf_path)
-            score = validation_report.get("score", 0)
-            threshold = self.config["validation_threshold"]
+        context["exported_files"] = exported_files
+        context["pdf_path"] = pdf_files[0] if pdf_files else None
+        return True
 
-            if score >= threshold:
-                print(f"✅ Validation PASSED (Score: {score}/{validation_report.get('max_score', 100)})")
-                self.results["success"] = True
-            else:
-                print(f"❌ Validation FAILED (Score: {score}/{validation_report.get('max_score', 100)})")
-                print(f"   Minimum required: {threshold}")
-                self.results["success"] = False
+    def _step_validate_pdf(self, context: Dict[str, Any]) -> bool:
+        # Step 5: Validate exported PDF (Layer 1)
+        pdf_path = context.get("pdf_path")
+        if not pdf_path:
+            return True
 
-            # Step 5.1: Run PDF quality validation (Layer 2)
-            pdf_quality_passed = self.run_pdf_quality_validation(pdf_path)
-            if not pdf_quality_passed:
-                print("❌ PDF quality validation FAILED")
-                self.results["success"] = False
+        validation_report = self.validate_pdf(pdf_path)
+        context["validation_report"] = validation_report
+        score = validation_report.get("score", 0)
+        threshold = self.config["validation_threshold"]
+
+        if score >= threshold:
+            print(f"✅ Validation PASSED (Score: {score}/{validation_report.get('max_score', 100)})")
+            context["score_passed"] = True
+        else:
+            print(f"❌ Validation FAILED (Score: {score}/{validation_report.get('max_score', 100)})")
+            print(f"   Minimum required: {threshold}")
+            context["score_passed"] = False
+        return context["score_passed"]
+
+    def _step_pdf_quality(self, context: Dict[str, Any]) -> bool:
+        # Step 5.1: Run PDF quality validation (Layer 2)
+        pdf_path = context.get("pdf_path")
+        if not pdf_path:
+            return True
+
+        passed = self.run_pdf_quality_validation(pdf_path)
+        if not passed:
+            print("❌ PDF quality validation FAILED")
+        context["pdf_quality_passed"] = passed
+        return passed
+
+    def _step_visual_regression(self, context: Dict[str, Any]) -> bool:
+        # Step 5.2: Run visual regression if baseline specified (Layer 3)
+        pdf_path = context.get("pdf_path")
+        job_config_path = self.config.get("job_config_path")
+        if not pdf_path or not job_config_path:
+            return True
+
+        qa_profile = self.load_qa_profile(job_config_path)
+        visual_baseline = qa_profile.get('visual_baseline_id') or self.config.get('visual_baseline')
+        if not visual_baseline:
+            return True
+
+        passed = self.run_visual_regression(pdf_path, visual_baseline)
+        if not passed:
+            print("❌ Visual regression test FAILED")
+        context["visual_passed"] = passed
+        return passed
+
+    def _step_gemini_review(self, context: Dict[str, Any]) -> bool:
+        # Step 5.3: Run Gemini Vision review if enabled (Layer 4)
+        pdf_path = context.get("pdf_path")
+        job_config_path = self.config.get("job_config_path")
+        if not pdf_path or not job_config_path:
+            return True
 
-            # Step 5.2: Run visual regression if baseline specified (Layer 3)
-            job_config_path = self.config.get("job_config_path")
-            if job_config_path:
-                qa_profile = self.load_qa_profile(job_config_path)
-                visual_baseline = qa_profile.get('visual_baseline_id') or self.config.get('visual_baseline')
-
-                if visual_baseline:
-                    visual_passed = self.run_visual_regression(pdf_path, visual_baseline)
-                    if not visual_passed:
-                        print("❌ Visual regression test FAILED")
-                        self.results["success"] = False
-
-            # Step 5.3: Run Gemini Vision review if enabled (Layer 4)
-            if job_config_path:
-                gemini_passed = self.run_gemini_vision_review(pdf_path, job_config_path)
-                if not gemini_passed:
-                    print("❌ Gemini Vision review FAILED")
-                    self.results["success"] = False
+        passed = self.run_gemini_vision_review(pdf_path, job_config_path)
+        if not passed:
+            print("❌ Gemini Vision review FAILED")
+        context["gemini_passed"] = passed
+        return passed
+
+    def _step_report(self, context: Dict[str, Any]) -> bool:
+        # Success needs a PDF that passed scoring and every QA layer that ran
+        if context.get("pdf_path"):
+            self.results["success"] = all(
+                context.get(key, True)
+                for key in ("score_passed", "pdf_quality_passed", "visual_passed", "gemini_passed")
+            )
 
         # Step 6: Generate and save report
         report = self.generate_report()
@@ -491,13 +1034,11 @@ class InDesignPipeline:
 
         # Step 7: Send notification (if configured)
         if self.config.get("notification_webhook"):
-            self.notify_webhook(validation_report)
+            self.notify_webhook(context.get("validation_report", {}))
 
         # Print summary
         print("\n" + report)
-
-        # Return success for CI/CD integration
-        return self.results["success"]
+        return True
 
     def run_validation_only(self) -> bool:
         """Execute validation-only pipeline (no InDesign export)"""
@@ -530,6 +1071,7 @@ class InDesignPipeline:
         print(f"[Pipeline] Threshold: {threshold}, TFU: {tfu_threshold}, Visual diff: {max_visual_diff}%")
 
         # Step 1: Run core document validation
+        from validate_document import DocumentValidator
         if job_config_path and os.path.exists(job_config_path):
             print(f"📋 Using job config: {job_config_path}")
             # Pass job config to validator for TFU compliance checks
@@ -572,24 +1114,20 @@ class InDesignPipeline:
                 self.results["success"] = False
                 self.results["error"] = error_msg
 
-        # Step 2: Run PDF quality validation (Layer 2)
-        pdf_quality_passed = self.run_pdf_quality_validation(pdf_path)
-        if not pdf_quality_passed:
-            print("❌ PDF quality validation FAILED")
-            self.results["success"] = False
-
-        # Step 3: Run visual regression if baseline specified (Layer 3)
+        # Steps 2-3.5: Layers 2/3/4 are independent subprocesses on the same PDF, so run them concurrently
+        layers = [("❌ PDF quality validation FAILED", self.run_pdf_quality_validation, (pdf_path,))]
         if visual_baseline:
-            visual_passed = self.run_visual_regression(pdf_path, visual_baseline)
-            if not visual_passed:
-                print("❌ Visual regression test FAILED")
-                self.results["success"] = False
+            layers.append(("❌ Visual regression test FAILED", self.run_visual_regression, (pdf_path, visual_baseline)))
+        layers.append(("❌ Gemini Vision review FAILED", self.run_gemini_vision_review, (pdf_path, job_config_path)))
 
-        # Step 3.5: Run Gemini Vision review if enabled (Layer 4)
-        gemini_passed = self.run_gemini_vision_review(pdf_path, job_config_path)
-        if not gemini_passed:
-            print("❌ Gemini Vision review FAILED")
-            self.results["success"] = False
+        with ThreadPoolExecutor(max_workers=len(layers)) as executor:
+            futures = [executor.submit(fn, *args) for _, fn, args in layers]
+
+        # Reduce in declaration order so output is deterministic
+        for (failure_msg, _, _), future in zip(layers, futures):
+            if not future.result():
+                print(failure_msg)
+                self.results["success"] = False
 
         # Step 4: Create baseline if needed and configured
         if self.results.get('success'):
@@ -617,6 +1155,7 @@ class InDesignPipeline:
 
         # Print summary
         print("\n" + report)
+        sys.stdout.flush()
 
         return self.results["success"]
 
@@ -624,18 +1163,13 @@ class InDesignPipeline:
         """Run PDF quality validation (Layer 2) - page dimensions, text cutoffs, colors, etc."""
         print(f"\n🔍 Running PDF quality validation (Layer 2)")
 
-        script_path = os.path.join(os.path.dirname(__file__), 'scripts', 'validate-pdf-quality.js')
-        if not os.path.exists(script_path):
+        script_path = self._paths["quality_js"]
+        if not self._paths_exist["quality_js"]:
             print("⚠️  WARNING: validate-pdf-quality.js not found, skipping PDF quality validation")
             return True  # Don't fail pipeline if script missing
 
         try:
-            result = subprocess.run(
-                ['node', script_path, pdf_path],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = _run_proc_sync(['node', script_path, pdf_path], timeout=120)
 
             # Exit code 0 = passed, 1 = failed
             if result.returncode == 0:
@@ -661,18 +1195,13 @@ class InDesignPipeline:
         """Run visual regression testing against baseline"""
         print(f"\n📸 Running visual regression test against: {baseline_name}")
 
-        script_path = os.path.join(os.path.dirname(__file__), 'scripts', 'compare-pdf-visual.js')
-        if not os.path.exists(script_path):
+        script_path = self._paths["visual_js"]
+        if not self._paths_exist["visual_js"]:
             print("⚠️  WARNING: compare-pdf-visual.js not found, skipping visual regression")
             return True  # Don't fail pipeline if script missing
 
         try:
-            result = subprocess.run(
-                ['node', script_path, pdf_path, baseline_name],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = _run_proc_sync(['node', script_path, pdf_path, baseline_name], timeout=120)
 
             # Parse comparison report JSON
             comparison_dir = self._find_latest_comparison_dir(baseline_name)
@@ -725,8 +1254,7 @@ class InDesignPipeline:
             print("[GEMINI] Skipped (no job config provided)")
             return True
 
-        with open(job_config_path, 'r') as f:
-            job_config = json.load(f)
+        job_config = _load_json(job_config_path)
 
         gemini_config = job_config.get('gemini_vision', {})
 
@@ -736,8 +1264,8 @@ class InDesignPipeline:
 
         print(f"\n🤖 Running Gemini Vision review (Layer 4)")
 
-        script_path = os.path.join(os.path.dirname(__file__), 'scripts', 'gemini-vision-review.js')
-        if not os.path.exists(script_path):
+        script_path = self._paths["gemini_js"]
+        if not self._paths_exist["gemini_js"]:
             print("⚠️  WARNING: gemini-vision-review.js not found, skipping Gemini review")
             return True  # Don't fail pipeline if script missing
 
@@ -752,14 +1280,12 @@ class InDesignPipeline:
         min_score = gemini_config.get('min_score', 0.90)
 
         try:
-            result = subprocess.run(
+            result = _run_proc_sync(
                 ['node', script_path,
                  '--pdf', pdf_path,
                  '--job-config', job_config_path,
                  '--output', output_file,
                  '--min-score', str(min_score)],
-                capture_output=True,
-                text=True,
                 timeout=300  # 5 minutes for AI processing
             )
 
@@ -793,21 +1319,20 @@ class InDesignPipeline:
 
     def _find_latest_comparison_dir(self, baseline_name: str) -> Optional[str]:
         """Find latest comparison directory for baseline"""
-        comparisons_dir = os.path.join(os.path.dirname(__file__), 'comparisons')
-        if not os.path.exists(comparisons_dir):
-            return None
-
-        matching_dirs = [
-            d for d in os.listdir(comparisons_dir)
-            if d.startswith(baseline_name)
-        ]
-
-        if not matching_dirs:
+        comparisons_dir = os.path.join(_MODULE_DIR, 'comparisons')
+        try:
+            with os.scandir(comparisons_dir) as entries:
+                # Names sort by timestamp (assuming format: baseline-YYYYMMDD-HHMMSS),
+                # so a single max() pass replaces the full sort; is_dir() uses d_type, no stat
+                latest = max(
+                    (e for e in entries if e.name.startswith(baseline_name) and e.is_dir()),
+                    key=lambda e: e.name,
+                    default=None
+                )
+        except FileNotFoundError:
             return None
 
-        # Sort by timestamp (assuming format: baseline-YYYYMMDD-HHMMSS)
-        latest = sorted(matching_dirs)[-1]
-        return os.path.join(comparisons_dir, latest)
+        return latest.path if latest else None
 
     def create_baseline_if_needed(self, pdf_path: str, qa_profile: Dict) -> bool:
         """Create visual baseline if configured and missing"""
@@ -826,17 +1351,15 @@ class InDesignPipeline:
         # Create baseline if configured
         if create_on_first_pass and self.results.get('success'):
             print(f"[Pipeline] Creating baseline: {baseline_id}")
-            script_path = 'scripts/create-reference-screenshots.js'
+            script_path = self._paths["baseline_js"]
 
-            if not os.path.exists(script_path):
+            if not self._paths_exist["baseline_js"]:
                 print("[Pipeline] ⚠️  create-reference-screenshots.js not found, skipping baseline creation")
                 return False
 
             try:
-                result = subprocess.run(
+                result = _run_proc_sync(
                     ['node', script_path, pdf_path, baseline_id],
-                    capture_output=True,
-                    text=True,
                     timeout=60
                 )
 
@@ -863,10 +1386,9 @@ class InDesignPipeline:
 
         if job_config_path and os.path.exists(job_config_path):
             try:
-                with open(job_config_path, 'r') as f:
-                    job = json.load(f)
-                    approval_config = job.get('approval', {})
-                    approval_mode = approval_config.get('mode', 'none')
+                job = _load_json(job_config_path)
+                approval_config = job.get('approval', {})
+                approval_mode = approval_config.get('mode', 'none')
             except Exception as e:
                 print(f"⚠️  Could not load approval config: {e}")
                 approval_mode = 'none'
@@ -883,7 +1405,7 @@ class InDesignPipeline:
         print(f"[Pipeline] Running approval workflow (mode: {approval_mode})")
 
         # Find scorecard JSON (generated in save_report)
-        scorecard_path = report_path.replace('.txt', '-scorecard.json')
+        scorecard_path = _scorecard_path(report_path)
         if not os.path.exists(scorecard_path):
             print(f"⚠️  Scorecard not found: {scorecard_path}")
             print("[Pipeline] Auto-approving (scorecard missing)")
@@ -894,8 +1416,8 @@ class InDesignPipeline:
             }
 
         # Build approval manager command
-        approval_script = os.path.join(os.path.dirname(__file__), 'approval', 'approval-manager.js')
-        if not os.path.exists(approval_script):
+        approval_script = self._paths["approval_js"]
+        if not self._paths_exist["approval_js"]:
             print(f"⚠️  Approval script not found: {approval_script}")
             print("[Pipeline] Auto-approving (approval system not available)")
             return {
@@ -919,13 +1441,20 @@ class InDesignPipeline:
         if approval_config.get('webhookUrl'):
             cmd.extend(['--webhook-url', approval_config['webhookUrl']])
 
+        # Tell the approval manager where to log its decision, so it can be read back
+        # directly instead of guessing the newest file in reports/approvals/
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        job_id = self.config.get("job_id", "unknown")
+        approval_log = os.path.join(
+            _MODULE_DIR, 'reports', 'approvals', f"approval-{job_id}-{timestamp}-{os.getpid()}.json"
+        )
+        cmd.extend(['--log-output', approval_log])
+
         # Run approval workflow
         approval_start_time = time.time()
         try:
-            result = subprocess.run(
+            result = _run_proc_sync(
                 cmd,
-                capture_output=True,
-                text=True,
                 timeout=approval_config.get('timeout', 3600) + 10  # Add buffer to timeout
             )
 
@@ -936,24 +1465,15 @@ class InDesignPipeline:
                 self.results["metrics"] = {}
             self.results["metrics"]["approval_wait_seconds"] = approval_duration
 
-            # Load approval result from logs
-            # The approval manager logs to reports/approvals/
-            approval_logs_dir = os.path.join(os.path.dirname(__file__), 'reports', 'approvals')
-            if os.path.exists(approval_logs_dir):
-                # Find most recent approval log
-                log_files = [f for f in os.listdir(approval_logs_dir) if f.startswith('approval-') and f.endswith('.json')]
-                if log_files:
-                    latest_log = max(log_files, key=lambda f: os.path.getmtime(os.path.join(approval_logs_dir, f)))
-                    latest_log_path = os.path.join(approval_logs_dir, latest_log)
-
-                    try:
-                        with open(latest_log_path, 'r') as f:
-                            approval_result = json.load(f)
-                            print(f"[Pipeline] Approval decision: {'APPROVED' if approval_result.get('approved') else 'REJECTED'}")
-                            print(f"[Pipeline] Approval duration: {approval_duration:.1f}s")
-                            return approval_result
-                    except Exception as e:
-                        print(f"⚠️  Could not parse approval log: {e}")
+            # Load approval result from the log this run asked for
+            if os.path.exists(approval_log):
+                try:
+                    approval_result = _read_json(approval_log)
+                    print(f"[Pipeline] Approval decision: {'APPROVED' if approval_result.get('approved') else 'REJECTED'}")
+                    print(f"[Pipeline] Approval duration: {approval_duration:.1f}s")
+                    return approval_result
+                except Exception as e:
+                    print(f"⚠️  Could not parse approval log: {e}")
 
             # Fallback: Check exit code
             if result.returncode == 0:
@@ -994,23 +1514,18 @@ class InDesignPipeline:
 
     def _generate_scorecard(self) -> Dict:
         """Generate compact QA scorecard with profile info"""
-        # Find validation report in results
-        validation_step = next(
-            (s for s in self.results["steps"] if s["name"] == "Validate PDF"),
-            None
-        )
-
-        # Find visual regression step
-        visual_step = next(
-            (s for s in self.results["steps"] if s["name"] == "Visual Regression"),
-            None
-        )
-
-        # Find baseline creation step
-        baseline_step = next(
-            (s for s in self.results["steps"] if s["name"] == "Create Baseline"),
-            None
-        )
+        # One pass over the steps: first step per name, plus the failure count
+        steps = self.results["steps"]
+        first_step: Dict[str, Step] = {}
+        failed_steps = 0
+        for s in steps:
+            first_step.setdefault(s.name, s)
+            if not s.success:
+                failed_steps += 1
+
+        validation_step = first_step.get("Validate PDF")
+        visual_step = first_step.get("Visual Regression")
+        baseline_step = first_step.get("Create Baseline")
 
         # Load QA profile
         qa_profile = self.load_qa_profile(self.config.get('job_config_path'))
@@ -1046,28 +1561,27 @@ class InDesignPipeline:
             "maxVisualDiffAllowed": self.config.get("max_visual_diff", 5.0),
             "visualBaseline": self.config.get("visual_baseline"),
             "baseline_status": "used" if visual_step else "missing",
-            "baseline_created": baseline_step is not None and baseline_step.get("success", False),
+            "baseline_created": baseline_step is not None and baseline_step.success,
 
             # Runtime metrics
             "metrics": {
                 "runtime_seconds": total_time,
-                "steps_completed": len(self.results["steps"]),
-                "steps_failed": len([s for s in self.results["steps"] if not s["success"]]),
+                "steps_completed": len(steps),
+                "steps_failed": failed_steps,
                 "validation_time": self.step_timings.get("Validate PDF", 0),
                 "visual_regression_time": self.step_timings.get("Visual Regression", 0)
             },
 
             # Overall result
             "passed": self.results["success"],
-            "steps": len(self.results["steps"]),
-            "failedSteps": len([s for s in self.results["steps"] if not s["success"]])
+            "steps": len(steps),
+            "failedSteps": failed_steps
         }
 
         # Extract visual diff if available
-        if visual_step and "details" in visual_step:
+        if visual_step and visual_step.details is not None:
             # Parse "Diff X.XX%" from details
-            import re
-            match = re.search(r"Diff ([\d.]+)%", visual_step.get("details", ""))
+            match = _VISUAL_DIFF_RE.search(visual_step.details)
             if match:
                 scorecard["visualDiffPercent"] = float(match.group(1))
 
@@ -1123,8 +1637,7 @@ class InDesignPipeline:
             pdf_basename = os.path.basename(pdf_path).replace('.pdf', '')
             report_path = os.path.join(output_dir, f"{pdf_basename}-smoldocling.json")
 
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2)
+            _write_json(result, report_path)
 
             print(f"Structural quality: {score:.3f}")
             print(f"Elements detected: {len(result.get('elements', []))}")
@@ -1207,8 +1720,7 @@ class InDesignPipeline:
 
             # Write report
             report_path = os.path.join(report_dir, f"{pdf_basename}-accessibility.json")
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2)
+            _write_json(result, report_path)
 
             print(f"Compliance score: {compliance_score:.3f}")
             print(f"Standards met: {', '.join(result.get('standards_met', []))}")
@@ -1266,104 +1778,131 @@ class InDesignPipeline:
         providers_cfg = job_config.get('providers', {})
         generation_cfg = job_config.get('generation', {})
 
-        # Figma Design Tokens
+        # Figma, image generation and font pairing are independent network-bound
+        # providers, so run the enabled ones concurrently (wall time ~ slowest one)
+        tasks = []
         figma_cfg = providers_cfg.get('figma', {})
         if figma_cfg.get('enabled', False):
-            try:
-                from services.figma_service import FigmaService
-
-                file_id = figma_cfg.get('fileId')
-                if file_id and file_id != 'REPLACE_WITH_FIGMA_FILE_ID':
-                    print("\n[Figma] Fetching design tokens...")
-                    figma = FigmaService(file_id=file_id)
-                    tokens = figma.fetch_design_tokens()
-
-                    if tokens.get('status') == 'success':
-                        print(f"  ✓ Fetched {len(tokens.get('colors', []))} colors")
-                        print(f"  ✓ Fetched {len(tokens.get('typography', []))} text styles")
-                        print(f"  → design-tokens/teei-figma-tokens.json")
-                        results['figma'] = tokens
-                    else:
-                        print(f"  ⚠ Figma sync skipped: {tokens.get('message', 'Unknown')}")
-                        results['figma'] = tokens
-                else:
-                    print("\n[Figma] ⊘ Figma file ID not configured")
-                    results['figma'] = {'status': 'disabled', 'message': 'File ID not configured'}
-            except Exception as e:
-                print(f"\n[Figma] ❌ Error: {e}")
-                results['figma'] = {'status': 'error', 'message': str(e)}
-                if figma_cfg.get('failOnError', False):
-                    raise
-
-        # Image Generation
+            tasks.append(('figma', self._smart_figma_tokens, (figma_cfg,)))
         images_cfg = providers_cfg.get('images', {})
         if images_cfg.get('enabled', False):
-            try:
-                from services.image_generation_service import ImageGenerationService
-
-                print("\n[Images] Generating hero images...")
-                image_gen = ImageGenerationService(
-                    provider=images_cfg.get('provider', 'local'),
-                    model=images_cfg.get('model'),
-                    output_dir=images_cfg.get('outputDir', 'assets/images/tfu/aws')
-                )
+            tasks.append(('images', self._smart_hero_images, (images_cfg, job_config)))
+        font_cfg = generation_cfg.get('fontPairing', {})
+        if font_cfg.get('enabled', False):
+            tasks.append(('fontPairing', self._smart_font_pairing, (font_cfg,)))
+
+        if tasks:
+            # Each provider logs into its own buffer so concurrent output doesn't interleave
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = []
+                for key, fn, args in tasks:
+                    lines: List[str] = []
+                    futures.append((key, lines, executor.submit(fn, *args, log=lines.append)))
+
+            # Collect in declaration order; result() re-raises failOnError errors
+            for key, lines, future in futures:
+                try:
+                    results[key] = future.result()
+                finally:
+                    if lines:
+                        sys.stdout.write("\n".join(lines) + "\n")
 
-                roles = images_cfg.get('roles', ['cover_hero'])
-                manifest = image_gen.generate_hero_images(job_config, roles)
+        print("="*60 + "\n")
+        return results
 
-                if manifest.get('status') == 'success':
-                    print(f"  ✓ Generated {len(manifest.get('images', {}))} images")
-                    print(f"  Provider: {images_cfg.get('provider', 'local')}")
-                    print(f"  → {manifest.get('manifest_path')}")
-                    results['images'] = manifest
+    def _smart_figma_tokens(self, figma_cfg: dict, log: Callable[[str], None] = print) -> dict:
+        """Smart generation: fetch Figma design tokens"""
+        try:
+            from services.figma_service import FigmaService
+
+            file_id = figma_cfg.get('fileId')
+            if file_id and file_id != 'REPLACE_WITH_FIGMA_FILE_ID':
+                log("\n[Figma] Fetching design tokens...")
+                figma = FigmaService(file_id=file_id)
+                tokens = figma.fetch_design_tokens()
+
+                if tokens.get('status') == 'success':
+                    log(f"  ✓ Fetched {len(tokens.get('colors', []))} colors")
+                    log(f"  ✓ Fetched {len(tokens.get('typography', []))} text styles")
+                    log(f"  → design-tokens/teei-figma-tokens.json")
+                    return tokens
                 else:
-                    print(f"  ⚠ Image generation skipped: {manifest.get('message', 'Unknown')}")
-                    results['images'] = manifest
-            except Exception as e:
-                print(f"\n[Images] ❌ Error: {e}")
-                results['images'] = {'enabled': True, 'status': 'error', 'message': str(e)}
-                if images_cfg.get('failOnError', False):
-                    raise
+                    log(f"  ⚠ Figma sync skipped: {tokens.get('message', 'Unknown')}")
+                    return tokens
+            else:
+                log("\n[Figma] ⊘ Figma file ID not configured")
+                return {'status': 'disabled', 'message': 'File ID not configured'}
+        except Exception as e:
+            log(f"\n[Figma] ❌ Error: {e}")
+            if figma_cfg.get('failOnError', False):
+                raise
+            return {'status': 'error', 'message': str(e)}
+
+    def _smart_hero_images(self, images_cfg: dict, job_config: dict,
+                           log: Callable[[str], None] = print) -> dict:
+        """Smart generation: generate hero images"""
+        try:
+            from services.image_generation_service import ImageGenerationService
 
-        # Font Pairing
-        font_cfg = generation_cfg.get('fontPairing', {})
-        if font_cfg.get('enabled', False):
-            try:
-                from services.font_pairing_engine import FontPairingEngine
+            log("\n[Images] Generating hero images...")
+            image_gen = ImageGenerationService(
+                provider=images_cfg.get('provider', 'local'),
+                model=images_cfg.get('model'),
+                output_dir=images_cfg.get('outputDir', 'assets/images/tfu/aws')
+            )
 
-                print("\n[Fonts] Validating font pairing...")
-                engine = FontPairingEngine()
+            roles = images_cfg.get('roles', ['cover_hero'])
+            manifest = image_gen.generate_hero_images(job_config, roles)
 
-                # Validate pairing for TFU
-                pairing_result = engine.validate_pairing(
-                    headline_font='Lora',
-                    body_font='Roboto',
-                    purpose='partnership',
-                    tfu_brand_lock=font_cfg.get('tfu_brand_lock', False)
-                )
+            if manifest.get('status') == 'success':
+                log(f"  ✓ Generated {len(manifest.get('images', {}))} images")
+                log(f"  Provider: {images_cfg.get('provider', 'local')}")
+                log(f"  → {manifest.get('manifest_path')}")
+                return manifest
+            else:
+                log(f"  ⚠ Image generation skipped: {manifest.get('message', 'Unknown')}")
+                return manifest
+        except Exception as e:
+            log(f"\n[Images] ❌ Error: {e}")
+            if images_cfg.get('failOnError', False):
+                raise
+            return {'enabled': True, 'status': 'error', 'message': str(e)}
 
-                score = pairing_result.get('harmony_score', 0)
-                passed = score >= 0.85
+    def _smart_font_pairing(self, font_cfg: dict, log: Callable[[str], None] = print) -> dict:
+        """Smart generation: validate the headline/body font pairing"""
+        try:
+            from services.font_pairing_engine import FontPairingEngine
 
-                print(f"  Pairing: Lora + Roboto")
-                print(f"  Harmony score: {score:.3f}")
-                print(f"  TFU compliant: {pairing_result.get('tfu_compliant', False)}")
-                print(f"  Status: {'✓ OK' if passed else '⚠ WARN'}")
+            log("\n[Fonts] Validating font pairing...")
+            engine = FontPairingEngine()
 
-                results['fontPairing'] = {
-                    'enabled': True,
-                    'score': score,
-                    'status': 'OK' if passed else 'WARN',
-                    'pairing': 'Lora + Roboto',
-                    'tfu_compliant': pairing_result.get('tfu_compliant', False)
-                }
+            # Validate pairing for TFU
+            pairing_result = engine.validate_pairing(
+                headline_font='Lora',
+                body_font='Roboto',
+                purpose='partnership',
+                tfu_brand_lock=font_cfg.get('tfu_brand_lock', False)
+            )
 
-            except Exception as e:
-                print(f"\n[Fonts] ⚠ Error: {e}")
-                results['fontPairing'] = {'enabled': True, 'status': 'SKIPPED', 'error': str(e)}
+            score = pairing_result.get('harmony_score', 0)
+            passed = score >= 0.85
 
-        print("="*60 + "\n")
-        return results
+            log(f"  Pairing: Lora + Roboto")
+            log(f"  Harmony score: {score:.3f}")
+            log(f"  TFU compliant: {pairing_result.get('tfu_compliant', False)}")
+            log(f"  Status: {'✓ OK' if passed else '⚠ WARN'}")
+
+            return {
+                'enabled': True,
+                'score': score,
+                'status': 'OK' if passed else 'WARN',
+                'pairing': 'Lora + Roboto',
+                'tfu_compliant': pairing_result.get('tfu_compliant', False)
+            }
+
+        except Exception as e:
+            log(f"\n[Fonts] ⚠ Error: {e}")
+            return {'enabled': True, 'status': 'SKIPPED', 'error': str(e)}
 
     def run_planning_phase(self, job_config: dict, job_config_path: str) -> dict:
         """
@@ -1546,10 +2085,8 @@ class InDesignPipeline:
 
         # Test MCP connection
         print("Testing MCP connection...")
-        test_result = subprocess.run(
+        test_result = _run_proc_sync(
             [sys.executable, "-B", "test_connection.py"],
-            capture_output=True,
-            text=True,
             timeout=15
         )
 
@@ -1561,10 +2098,8 @@ class InDesignPipeline:
 
         # Execute V2 generator
         print("Executing V2 generator...")
-        gen_result = subprocess.run(
+        gen_result = _run_proc_sync(
             [sys.executable, "-B", "execute_tfu_aws_v2.py"],
-            capture_output=True,
-            text=True,
             timeout=90
         )
 
@@ -1576,10 +2111,8 @@ class InDesignPipeline:
 
         # Export PDF
         print("Exporting PDF...")
-        export_result = subprocess.run(
+        export_result = _run_proc_sync(
             [sys.executable, "-B", "export_v2_now.py"],
-            capture_output=True,
-            text=True,
             timeout=60
         )
 
@@ -1613,10 +2146,8 @@ class InDesignPipeline:
             "--strict"
         ]
 
-        layer1_result = subprocess.run(
+        layer1_result = _run_proc_sync(
             layer1_cmd,
-            capture_output=True,
-            text=True,
             timeout=90
         )
 
@@ -1653,10 +2184,8 @@ class InDesignPipeline:
             "node", "scripts/validate-pdf-quality.js", pdf_path
         ]
 
-        layer2_result = subprocess.run(
+        layer2_result = _run_proc_sync(
             layer2_cmd,
-            capture_output=True,
-            text=True,
             timeout=60
         )
 
@@ -1681,10 +2210,8 @@ class InDesignPipeline:
             pdf_path, visual_baseline
         ]
 
-        layer3_result = subprocess.run(
+        layer3_result = _run_proc_sync(
             layer3_cmd,
-            capture_output=True,
-            text=True,
             timeout=90
         )
 
@@ -1731,10 +2258,8 @@ class InDesignPipeline:
             ]
 
             try:
-                layer35_result = subprocess.run(
+                layer35_result = _run_proc_sync(
                     layer35_cmd,
-                    capture_output=True,
-                    text=True,
                     timeout=60
                 )
 
@@ -1823,10 +2348,8 @@ class InDesignPipeline:
                 print(f"Min score: {layer4_min_score}")
                 print("Status: ✓ PASS (DRY RUN)\n")
             else:
-                layer4_result = subprocess.run(
+                layer4_result = _run_proc_sync(
                     layer4_cmd,
-                    capture_output=True,
-                    text=True,
                     timeout=120
                 )
 
@@ -2010,8 +2533,7 @@ class InDesignPipeline:
             }
         }
 
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2)
+        _write_json(summary, summary_path)
 
         print(f"Summary written to: {summary_path}\n")
 
@@ -2058,8 +2580,9 @@ class InDesignPipeline:
 
         return all_passed
 
-def main():
-    """Main entry point"""
+@functools.cache
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; parse_args doesn't mutate it, so it is reused across main() calls"""
     parser = argparse.ArgumentParser(
         description="Automated InDesign Export & Analysis Pipeline"
     )
@@ -2123,7 +2646,11 @@ def main():
         help="Run world-class 4-layer pipeline (generation + all 4 QA layers)"
     )
 
-    args = parser.parse_args()
+    return parser
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point (argv defaults to sys.argv[1:])"""
+    args = _build_parser().parse_args(argv)
 
     # Override config with CLI arguments
     config_overrides = {}
@@ -5,32 +5,84 @@ Executes ExtendScript to populate 3-page document with content
 
 Usage:
     python populate_content.py
+
+Requires aiohttp (listed in requirements-extended.txt).
 """
 
 import os
 import sys
-import json
-import requests
+import asyncio
 from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # MCP Bridge configuration
 MCP_BRIDGE_URL = "http://localhost:8012"
 EXTENDSCRIPT_FILE = "populate_aws_partnership_content.jsx"
+_SCRIPT_PATH = Path(__file__).parent / EXTENDSCRIPT_FILE
+
+# One session is shared by every bridge call so the TCP connection is reused
+CONNECTOR_LIMIT = 8
+KEEPALIVE_TIMEOUT = 60
+
+# Multipart scriptFile uploads need bridge support; the default is the JSON scriptString body
+MULTIPART_UPLOAD = os.environ.get("MCP_BRIDGE_MULTIPART") == "1"
+
+# Bridge liveness: cheap TCP connect probe first, retried with backoff, then /health
+PROBE_TIMEOUT = 0.05
+PROBE_BACKOFF = (0.05, 0.2, 1.0)
 
-def read_extendscript():
-    """Read the ExtendScript file"""
-    script_path = Path(__file__).parent / EXTENDSCRIPT_FILE
+def create_session():
+    """Open the shared aiohttp session for the MCP bridge"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=CONNECTOR_LIMIT, keepalive_timeout=KEEPALIVE_TIMEOUT)
+    )
 
-    if not script_path.exists():
-        raise FileNotFoundError(f"ExtendScript file not found: {script_path}")
+def locate_extendscript():
+    """Return the ExtendScript file path, checking it exists"""
+    if not _SCRIPT_PATH.exists():
+        raise FileNotFoundError(f"ExtendScript file not found: {_SCRIPT_PATH}")
 
-    with open(script_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return _SCRIPT_PATH
 
-def execute_extendscript(script_code):
-    """Execute ExtendScript via MCP bridge"""
+async def execute_extendscript(session, script_path):
+    """Execute ExtendScript via MCP bridge
+
+    Sends the script inline as JSON {"tool", "args": {"scriptString"}}, the bridge's /execute
+    contract. Set MCP_BRIDGE_MULTIPART=1 to stream it as a multipart scriptFile instead, for
+    bridges that accept uploads.
+    """
     try:
-        response = requests.post(
+        if MULTIPART_UPLOAD:
+            with open(script_path, 'rb') as f:
+                form = aiohttp.FormData()
+                form.add_field("tool", "executeExtendScript")
+                form.add_field("scriptFile", f, filename=script_path.name,
+                               content_type="application/javascript")
+
+                async with session.post(
+                    f"{MCP_BRIDGE_URL}/execute",
+                    data=form,
+                    timeout=aiohttp.ClientTimeout(total=60)
+                ) as response:
+                    response.raise_for_status()
+                    return await response.json()
+
+        script_code = await asyncio.get_running_loop().run_in_executor(
+            None, script_path.read_text, 'utf-8'
+        )
+        async with session.post(
             f"{MCP_BRIDGE_URL}/execute",
             json={
                 "tool": "executeExtendScript",
@@ -38,15 +90,12 @@ def execute_extendscript(script_code):
                     "scriptString": script_code
                 }
             },
-            timeout=60
-        )
+            timeout=aiohttp.ClientTimeout(total=60)
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
 
-        response.raise_for_status()
-        result = response.json()
-
-        return result
-
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         raise ConnectionError(
             f"Cannot connect to MCP bridge at {MCP_BRIDGE_URL}\n"
             "Please ensure:\n"
@@ -54,15 +103,15 @@ def execute_extendscript(script_code):
             "2. MCP bridge is running: python mcp-local/mcp_http_bridge.py\n"
             "3. InDesign MCP plugin is installed"
         )
-    except requests.exceptions.Timeout:
+    except asyncio.TimeoutError:
         raise TimeoutError("ExtendScript execution timed out (60s)")
     except Exception as e:
         raise Exception(f"ExtendScript execution failed: {str(e)}")
 
-def validate_document():
+async def validate_document(session):
     """Check if InDesign document is open and has 3 pages"""
     try:
-        response = requests.post(
+        async with session.post(
             f"{MCP_BRIDGE_URL}/execute",
             json={
                 "tool": "executeExtendScript",
@@ -80,28 +129,59 @@ def validate_document():
                     """
                 }
             },
-            timeout=10
-        )
-
-        response.raise_for_status()
-        result = response.json()
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            response.raise_for_status()
+            result = await response.json()
 
         return result
 
     except Exception as e:
         return {"error": str(e)}
 
-def main():
+async def probe_bridge():
+    """Return True once a TCP connection to the bridge port succeeds, retrying with backoff"""
+    url = urlsplit(MCP_BRIDGE_URL)
+    for delay in (0,) + PROBE_BACKOFF:
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(url.hostname, url.port or 80), PROBE_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError):
+            continue
+        writer.close()
+        return True
+    return False
+
+async def check_health(session):
+    """Return the MCP bridge /health status code"""
+    if not await probe_bridge():
+        raise ConnectionError(f"Nothing listening at {MCP_BRIDGE_URL}")
+
+    async with session.get(f"{MCP_BRIDGE_URL}/health", timeout=aiohttp.ClientTimeout(total=1)) as response:
+        return response.status
+
+async def main():
+    async with create_session() as session:
+        await run(session)
+
+async def run(session):
     print("=" * 70)
     print("TEEI AWS Partnership - Content Population")
     print("=" * 70)
     print()
 
+    # Locate the ExtendScript off the event loop while the bridge health check is in flight
+    loop = asyncio.get_running_loop()
+    script_task = loop.run_in_executor(None, locate_extendscript)
+
     # Step 1: Validate MCP bridge connection
     print("Step 1: Checking MCP bridge connection...")
     try:
-        response = requests.get(f"{MCP_BRIDGE_URL}/health", timeout=5)
-        if response.status_code == 200:
+        status = await check_health(session)
+        if status == 200:
             print("✅ MCP bridge is running")
         else:
             print("❌ MCP bridge returned unexpected status")
@@ -116,7 +196,7 @@ def main():
 
     # Step 2: Validate InDesign document
     print("Step 2: Validating InDesign document...")
-    doc_info = validate_document()
+    doc_info = await validate_document(session)
 
     if "error" in doc_info:
         print(f"❌ Document validation failed: {doc_info['error']}")
@@ -136,10 +216,10 @@ def main():
     print()
 
     # Step 3: Read ExtendScript
-    print("Step 3: Loading ExtendScript...")
+    print("Step 3: Locating ExtendScript...")
     try:
-        script_code = read_extendscript()
-        print(f"✅ Loaded {EXTENDSCRIPT_FILE} ({len(script_code)} chars)")
+        script_path = await script_task
+        print(f"✅ Found {EXTENDSCRIPT_FILE} ({script_path.stat().st_size} bytes)")
     except Exception as e:
         print(f"❌ Failed to load ExtendScript: {e}")
         sys.exit(1)
@@ -155,7 +235,7 @@ def main():
     print()
 
     try:
-        result = execute_extendscript(script_code)
+        result = await execute_extendscript(session, script_path)
 
         if "error" in result:
             print(f"❌ ExtendScript error: {result['error']}")
@@ -185,4 +265,9 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    if not AIOHTTP_AVAILABLE:
+        print("❌ aiohttp is required. Install with: pip install -r requirements-extended.txt")
+        sys.exit(1)
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+    asyncio.run(main())
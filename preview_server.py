@@ -7,27 +7,60 @@ Auto-exports and serves PDFs with live refresh
 import os
 import sys
 import time
+import atexit
 import json
+import gzip
+import hashlib
 import tempfile
 import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
 
 # Add InDesign automation modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'adb-mcp', 'mcp'))
 
 try:
-    from flask import Flask, send_file, jsonify, render_template_string
+    from flask import Flask, Response, request, send_file, jsonify
     FLASK_AVAILABLE = True
 except ImportError:
     FLASK_AVAILABLE = False
     print("⚠️  Flask not installed. Run: pip install flask")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
 from core import init, sendCommand, createCommand
 import socket_client
 
 app = Flask(__name__) if FLASK_AVAILABLE else None
 
+# preview_YYYYMMDD_HHMMSS.pdf, as written by versions before the single preview.pdf
+LEGACY_PREVIEW_GLOB = 'preview_' + '[0-9]' * 8 + '_' + '[0-9]' * 6 + '.pdf'
+
+# Wall-clock HH:MM:SS, reformatted at most once per second
+_last_ts_sec = 0
+_last_ts_str = ''
+
+def fast_hms():
+    """Current local time as HH:MM:SS, memoized to one-second granularity"""
+    global _last_ts_sec, _last_ts_str
+    s = int(time.time())
+    if s != _last_ts_sec:
+        _last_ts_str = time.strftime('%H:%M:%S', time.localtime(s))
+        _last_ts_sec = s
+    return _last_ts_str
+
 class InDesignPreviewServer:
     """Live preview server for InDesign documents"""
 
@@ -37,11 +70,33 @@ class InDesignPreviewServer:
         self.last_export = None
         self.export_status = "Not started"
         self.document_info = {}
+        # Guards writes to the shared state above; request threads only read it
+        self._state_lock = threading.Lock()
+        # Single-flight export: concurrent callers share the in-flight InDesign export
+        self._export_lock = threading.Lock()
+        self._export_in_flight = None
+        self._info_executor = ThreadPoolExecutor(max_workers=1)
+        # Notified after each successful export; /events streams wait on it
+        self._export_done = threading.Condition()
+
+        # Last export held in memory so /pdf doesn't re-read the file per refresh
+        self._pdf_bytes = None
+        self._pdf_etag = None
+
+        # Every export overwrites one preview.pdf; the generation counter busts the browser cache
+        self._pdf_path = os.path.join(self.export_path, 'preview.pdf')
+        self._pdf_tmp_path = os.path.join(self.export_path, 'preview.tmp.pdf')
+        self._pdf_generation = 0
+        atexit.register(self._remove_preview)
+
+        # Sweep timestamped preview PDFs left by older versions; none are created any more
+        self._cleanup_old()
 
         # InDesign connection
         self.APPLICATION = "indesign"
         self.PROXY_URL = 'http://localhost:8013'
         self.connected = False
+        self._client_configured = False
 
         # Initialize connection
         self.connect_to_indesign()
@@ -49,45 +104,75 @@ class InDesignPreviewServer:
     def connect_to_indesign(self):
         """Connect to InDesign via MCP proxy"""
         try:
-            socket_client.configure(
-                app=self.APPLICATION,
-                url=self.PROXY_URL,
-                timeout=30
-            )
-            init(self.APPLICATION, socket_client)
+            # The client configuration never changes, so reconnect attempts only re-ping
+            if not self._client_configured:
+                socket_client.configure(
+                    app=self.APPLICATION,
+                    url=self.PROXY_URL,
+                    timeout=30
+                )
+                init(self.APPLICATION, socket_client)
+                self._client_configured = True
 
             # Test connection
             response = sendCommand(createCommand("ping", {}))
             if response.get("status") == "SUCCESS":
-                self.connected = True
-                self.export_status = "Connected to InDesign"
+                self._set_state(connected=True, export_status="Connected to InDesign")
                 print("✅ Connected to InDesign")
             else:
-                self.connected = False
-                self.export_status = "InDesign not responding"
+                self._set_state(connected=False, export_status="InDesign not responding")
                 print("❌ InDesign not responding")
 
         except Exception as e:
-            self.connected = False
-            self.export_status = f"Connection error: {str(e)}"
+            self._set_state(connected=False, export_status=f"Connection error: {str(e)}")
             print(f"❌ Connection error: {e}")
 
+    def _set_state(self, **fields):
+        """Update shared server state under the state lock"""
+        with self._state_lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
     def export_current_document(self):
-        """Export current InDesign document to PDF"""
+        """Export current InDesign document to PDF, joining an export already in progress"""
+        with self._export_lock:
+            in_flight = self._export_in_flight
+            if in_flight is None:
+                in_flight = self._export_in_flight = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            return in_flight.result()
+
+        try:
+            pdf_path = self._export()
+            in_flight.set_result(pdf_path)
+            return pdf_path
+        except BaseException as e:
+            in_flight.set_exception(e)
+            raise
+        finally:
+            with self._export_lock:
+                self._export_in_flight = None
+
+    def _export(self):
+        """Run one InDesign PDF export and update the cached preview"""
         if not self.connected:
             self.connect_to_indesign()
             if not self.connected:
                 return None
 
         try:
-            # Generate unique filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            pdf_filename = f"preview_{timestamp}.pdf"
-            pdf_path = os.path.join(self.export_path, pdf_filename)
+            pdf_path = self._pdf_path
+            # InDesign writes beside the target and the result is renamed into place,
+            # so /pdf never reads a half-written file
+            tmp_path = self._pdf_tmp_path
 
             # Export PDF via MCP
             export_command = createCommand("exportPDF", {
-                "outputPath": pdf_path,
+                "outputPath": tmp_path,
                 "preset": "High Quality Print",
                 "viewPDF": False
             })
@@ -96,26 +181,73 @@ class InDesignPreviewServer:
             response = sendCommand(export_command)
 
             if response.get("status") == "SUCCESS":
-                self.last_export = pdf_path
-                self.export_status = f"Exported at {datetime.now().strftime('%H:%M:%S')}"
-
-                # Get document info
-                info_response = sendCommand(createCommand("readDocumentInfo", {}))
+                os.replace(tmp_path, pdf_path)
+
+                # Get document info while the exported PDF is read into memory
+                info_future = self._info_executor.submit(sendCommand, createCommand("readDocumentInfo", {}))
+
+                pdf_bytes, pdf_etag = self._read_pdf(pdf_path)
+                self._set_state(
+                    last_export=pdf_path,
+                    _pdf_bytes=pdf_bytes,
+                    _pdf_etag=pdf_etag,
+                    _pdf_generation=self._pdf_generation + 1,
+                    export_status=f"Exported at {fast_hms()}"
+                )
+
+                try:
+                    info_response = info_future.result(timeout=5)
+                except Exception:
+                    info_response = {}  # Stale info is fine; the export itself succeeded
                 if info_response.get("status") == "SUCCESS":
-                    self.document_info = info_response.get("response", {})
+                    self._set_state(document_info=info_response.get("response", {}))
+
+                with self._export_done:
+                    self._export_done.notify_all()
 
-                print(f"✅ Export successful: {pdf_filename}")
+                print(f"✅ Export successful: {os.path.basename(pdf_path)}")
                 return pdf_path
             else:
-                self.export_status = f"Export failed: {response.get('message', 'Unknown error')}"
+                self._set_state(export_status=f"Export failed: {response.get('message', 'Unknown error')}")
                 print(f"❌ Export failed: {response}")
                 return None
 
         except Exception as e:
-            self.export_status = f"Export error: {str(e)}"
+            self._set_state(export_status=f"Export error: {str(e)}")
             print(f"❌ Export error: {e}")
             return None
 
+    def wait_for_export(self, generation, timeout):
+        """Block until an export newer than generation lands (or timeout); return the current generation"""
+        with self._export_done:
+            self._export_done.wait_for(lambda: self._pdf_generation != generation, timeout)
+        return self._pdf_generation
+
+    def _cleanup_old(self):
+        """Delete legacy preview_<timestamp>.pdf files; other programs' files in the temp dir are left alone"""
+        for p in Path(self.export_path).glob(LEGACY_PREVIEW_GLOB):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def _remove_preview(self):
+        """Delete the preview PDF on shutdown so it doesn't linger in the temp dir"""
+        try:
+            os.unlink(self._pdf_path)
+        except OSError:
+            pass
+
+    def _read_pdf(self, pdf_path):
+        """Load an exported PDF and derive its ETag; (None, None) if unreadable"""
+        try:
+            with open(pdf_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None, None
+
+        return data, hashlib.blake2b(data, digest_size=8).hexdigest()
+
     def get_latest_pdf(self):
         """Get the most recent PDF or create one"""
         if not self.last_export or not os.path.exists(self.last_export):
@@ -123,8 +255,43 @@ class InDesignPreviewServer:
 
         return self.last_export
 
-# Create global server instance
-preview_server = InDesignPreviewServer() if FLASK_AVAILABLE else None
+# Global server instance, created on first request so the port binds without
+# waiting on the InDesign connection probe
+preview_server = None
+_preview_server_lock = threading.Lock()
+
+# Validation runs off the request threads; recent jobs are kept for polling
+MAX_VALIDATE_JOBS = 32
+_validate_executor = ThreadPoolExecutor(max_workers=1)
+_validate_jobs = OrderedDict()
+_validate_jobs_lock = threading.Lock()
+
+# Each /events stream holds a server thread for as long as the page is open; cap them so
+# /pdf, /export and /status keep threads to run on. Pages over the cap fall back to polling.
+MAX_EVENT_STREAMS = 4
+STREAM_MAX_SECONDS = 300  # Streams end after this; EventSource reconnects with Last-Event-ID
+_event_streams = threading.BoundedSemaphore(MAX_EVENT_STREAMS)
+
+def _run_validation(pdf_path):
+    """Validate a PDF with DocumentValidator and return its report"""
+    from validate_document import DocumentValidator
+    return DocumentValidator(pdf_path).validate_all()
+
+def ojson(obj, status=200):
+    """JSON response via orjson when available (serializes straight to bytes), else jsonify"""
+    if ORJSON_AVAILABLE:
+        return Response(orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS),
+                        status=status, mimetype='application/json')
+    return jsonify(obj), status
+
+def get_server():
+    """Return the shared InDesignPreviewServer, creating it on first use"""
+    global preview_server
+    if preview_server is None:
+        with _preview_server_lock:
+            if preview_server is None:
+                preview_server = InDesignPreviewServer()
+    return preview_server
 
 # HTML template for the preview page
 HTML_TEMPLATE = '''
@@ -322,12 +489,12 @@ HTML_TEMPLATE = '''
             <div class="toggle {{ 'active' if auto_refresh else '' }}" onclick="toggleAutoRefresh(this)">
                 <div class="toggle-slider"></div>
             </div>
-            <span id="refresh-timer">{{ refresh_interval }}s</span>
+            <span id="refresh-timer">{{ 'live' if auto_refresh else 'paused' }}</span>
         </div>
     </div>
 
     <div class="preview-container">
-        <iframe id="pdf-preview" src="/pdf"></iframe>
+        <iframe id="pdf-preview" src="/pdf?g={{ generation }}"></iframe>
     </div>
 
     <div class="info">
@@ -343,12 +510,11 @@ HTML_TEMPLATE = '''
 
     <script>
         let autoRefreshEnabled = {{ 'true' if auto_refresh else 'false' }};
-        let refreshInterval = {{ refresh_interval }};
-        let countdown = refreshInterval;
+        let pdfGeneration = {{ generation }};
 
         function refreshPreview() {
             document.getElementById('loading').style.display = 'block';
-            document.getElementById('pdf-preview').src = '/pdf?t=' + Date.now();
+            document.getElementById('pdf-preview').src = '/pdf?g=' + pdfGeneration;
             setTimeout(() => {
                 document.getElementById('loading').style.display = 'none';
             }, 1000);
@@ -360,6 +526,7 @@ HTML_TEMPLATE = '''
                 .then(response => response.json())
                 .then(data => {
                     if (data.success) {
+                        pdfGeneration = data.generation;
                         refreshPreview();
                     } else {
                         alert('Export failed: ' + data.message);
@@ -373,28 +540,77 @@ HTML_TEMPLATE = '''
         }
 
         function validateDocument() {
-            window.open('/validate', '_blank');
+            // Open the tab now (popup blockers) and point it at the report once ready
+            const win = window.open('', '_blank');
+            fetch('/validate')
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.job) {
+                        win.document.body.textContent = data.error || 'Validation failed';
+                        return;
+                    }
+                    win.document.body.textContent = 'Validating...';
+                    const poll = () => fetch(data.status_url).then(response => {
+                        if (response.status === 202) {
+                            setTimeout(poll, 1000);
+                        } else {
+                            win.location = data.status_url;
+                        }
+                    });
+                    poll();
+                })
+                .catch(error => {
+                    win.document.body.textContent = 'Error: ' + error;
+                });
         }
 
         function toggleAutoRefresh(element) {
             autoRefreshEnabled = !autoRefreshEnabled;
             element.classList.toggle('active');
-            if (autoRefreshEnabled) {
-                countdown = refreshInterval;
-            }
+            document.getElementById('refresh-timer').textContent = autoRefreshEnabled ? 'live' : 'paused';
         }
 
-        // Auto-refresh logic
-        setInterval(() => {
-            if (autoRefreshEnabled) {
-                countdown--;
-                if (countdown <= 0) {
+        // Auto-refresh: the server pushes an event only when a new export exists
+        let refreshPending = false;
+        function onGeneration(generation) {
+            if (generation !== pdfGeneration) {
+                pdfGeneration = generation;
+                if (!autoRefreshEnabled) {
+                    return;
+                }
+                // Hidden tabs don't download; catch up once when shown again
+                if (document.hidden) {
+                    refreshPending = true;
+                } else {
                     refreshPreview();
-                    countdown = refreshInterval;
                 }
-                document.getElementById('refresh-timer').textContent = countdown + 's';
             }
-        }, 1000);
+        }
+
+        const events = new EventSource('/events?g=' + pdfGeneration);
+        events.onmessage = (e) => onGeneration(JSON.parse(e.data).generation);
+        events.onerror = () => {
+            // Closed for good (e.g. 503 when too many pages are streaming): poll instead
+            if (events.readyState === EventSource.CLOSED) {
+                setInterval(() => {
+                    if (!document.hidden) {
+                        fetch('/status')
+                            .then(response => response.json())
+                            .then(data => onGeneration(data.generation))
+                            .catch(() => {});
+                    }
+                }, 5000);
+            }
+        };
+
+        document.addEventListener('visibilitychange', () => {
+            if (!document.hidden && refreshPending && autoRefreshEnabled) {
+                refreshPending = false;
+                refreshPreview();
+            }
+        });
+
+        window.addEventListener('beforeunload', () => events.close());
 
         // Initial load
         window.addEventListener('load', () => {
@@ -420,74 +636,174 @@ HTML_TEMPLATE = '''
 '''
 
 if FLASK_AVAILABLE:
+    # Parsed once; render_template_string would look it up on every GET
+    _TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+    # (rendered html, gzip bytes) of the last compressed index page
+    _index_gz = ('', b'')
+
     @app.route('/')
     def index():
-        """Main preview page"""
-        return render_template_string(HTML_TEMPLATE,
-            connected=preview_server.connected,
-            status=preview_server.export_status,
-            last_update=datetime.now().strftime('%H:%M:%S'),
+        """Main preview page, gzip-compressed when the browser accepts it"""
+        global _index_gz
+        server = get_server()
+        html = _TEMPLATE.render(
+            connected=server.connected,
+            status=server.export_status,
+            last_update=fast_hms(),
             auto_refresh=True,
-            refresh_interval=preview_server.auto_refresh,
-            has_pdf=preview_server.last_export is not None,
-            doc_name=preview_server.document_info.get('name', 'Unknown'),
-            page_count=preview_server.document_info.get('pages', 'N/A'),
-            doc_size=f"{preview_server.document_info.get('size_mb', 0):.1f} MB"
+            has_pdf=server.last_export is not None,
+            generation=server._pdf_generation,
+            doc_name=server.document_info.get('name', 'Unknown'),
+            page_count=server.document_info.get('pages', 'N/A'),
+            doc_size=f"{server.document_info.get('size_mb', 0):.1f} MB"
         )
 
+        if 'gzip' not in request.headers.get('Accept-Encoding', ''):
+            return Response(html, mimetype='text/html', headers={'Vary': 'Accept-Encoding'})
+
+        # Output only changes with the clock or server state; reuse the last compression
+        cached_html, body = _index_gz
+        if html != cached_html:
+            body = gzip.compress(html.encode('utf-8'), compresslevel=9)
+            _index_gz = (html, body)
+
+        return Response(body, mimetype='text/html',
+                        headers={'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'})
+
     @app.route('/pdf')
     def serve_pdf():
-        """Serve the current PDF"""
-        pdf_path = preview_server.get_latest_pdf()
-        if pdf_path and os.path.exists(pdf_path):
-            return send_file(pdf_path, mimetype='application/pdf')
-        else:
-            return "No PDF available. Please export from InDesign.", 404
+        """Serve the current PDF from memory; 304s and byte ranges handled via make_conditional"""
+        server = get_server()
+        if server._pdf_bytes is None:
+            pdf_path = server.get_latest_pdf()
+            if server._pdf_bytes is None:
+                try:
+                    st = os.stat(pdf_path) if pdf_path else None
+                except FileNotFoundError:
+                    st = None
+                if st is None:
+                    return "No PDF available. Please export from InDesign.", 404
+
+                # Cache miss: let the WSGI file wrapper stream the file (sendfile where supported)
+                response = send_file(pdf_path, mimetype='application/pdf',
+                                     conditional=True, etag=True,
+                                     last_modified=st.st_mtime, max_age=1)
+                response.headers['Accept-Ranges'] = 'bytes'
+                return response
+
+        response = Response(server._pdf_bytes, mimetype='application/pdf',
+                            headers={'Cache-Control': 'no-cache'})
+        response.set_etag(server._pdf_etag)
+        # Answers If-None-Match with 304 and Range with 206 so the viewer can paint page one early
+        return response.make_conditional(request, accept_ranges=True)
+
+    @app.route('/events')
+    def events():
+        """Server-Sent Events: one message per new export, keep-alive comments in between"""
+        if not _event_streams.acquire(blocking=False):
+            # EventSource gives up on a non-200 response; the page then polls /status
+            return Response("retry: 30000\n\n", status=503, mimetype='text/event-stream',
+                            headers={'Retry-After': '30', 'Cache-Control': 'no-cache'})
+
+        server = get_server()
+        last = request.headers.get('Last-Event-ID', type=int)
+        if last is None:
+            last = request.args.get('g', default=-1, type=int)
+
+        def stream():
+            nonlocal last
+            deadline = time.monotonic() + STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                generation = server.wait_for_export(last, timeout=15)
+                if generation == last:
+                    yield ": keep-alive\n\n"
+                    continue
+                last = generation
+                payload = json.dumps({'generation': generation, 'etag': server._pdf_etag})
+                yield f"id: {generation}\ndata: {payload}\n\n"
+
+        response = Response(stream(), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache'})
+        # Runs when the server closes the response, whether or not the stream started
+        response.call_on_close(_event_streams.release)
+        return response
 
     @app.route('/export', methods=['POST'])
     def export_pdf():
         """Trigger a new export"""
-        pdf_path = preview_server.export_current_document()
+        server = get_server()
+        pdf_path = server.export_current_document()
         if pdf_path:
-            return jsonify({
+            return ojson({
                 'success': True,
                 'path': pdf_path,
+                'generation': server._pdf_generation,
                 'message': 'Export successful'
             })
         else:
-            return jsonify({
+            return ojson({
                 'success': False,
-                'message': preview_server.export_status
+                'message': server.export_status
             })
 
     @app.route('/validate')
     def validate():
-        """Run validation on current PDF"""
-        if preview_server.last_export:
-            # Import and run validator
-            from validate_document import DocumentValidator
-            validator = DocumentValidator(preview_server.last_export)
-            report = validator.validate_all()
-            return jsonify(report)
-        else:
-            return jsonify({'error': 'No PDF to validate'}), 404
+        """Start validation of the current PDF in the background; poll /validate/<job>"""
+        server = get_server()
+        if not server.last_export:
+            return ojson({'error': 'No PDF to validate'}, 404)
+
+        job_id = uuid.uuid4().hex
+        with _validate_jobs_lock:
+            _validate_jobs[job_id] = _validate_executor.submit(_run_validation, server.last_export)
+            while len(_validate_jobs) > MAX_VALIDATE_JOBS:
+                _validate_jobs.popitem(last=False)
+
+        return ojson({'job': job_id, 'status_url': f'/validate/{job_id}'}, 202)
+
+    @app.route('/validate/<job_id>')
+    def validate_result(job_id):
+        """Validation report for a job, or 202 while it is still running"""
+        with _validate_jobs_lock:
+            future = _validate_jobs.get(job_id)
+        if future is None:
+            return ojson({'error': 'Unknown validation job'}, 404)
+        if not future.done():
+            return ojson({'job': job_id, 'status': 'running'}, 202)
+
+        try:
+            return ojson(future.result())
+        except Exception as e:
+            return ojson({'error': str(e)}, 500)
 
     @app.route('/status')
     def status():
         """Get server status as JSON"""
-        return jsonify({
-            'connected': preview_server.connected,
-            'status': preview_server.export_status,
-            'last_export': preview_server.last_export,
-            'document_info': preview_server.document_info
+        server = get_server()
+        return ojson({
+            'connected': server.connected,
+            'status': server.export_status,
+            'last_export': server.last_export,
+            'generation': server._pdf_generation,
+            'document_info': server.document_info
         })
 
 def main():
     """Run the preview server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Real-time preview server for InDesign documents")
+    parser.add_argument("--debug", action="store_true",
+                       help="Run Flask's debug server (tracebacks in the browser, no reloader)")
+    args = parser.parse_args()
+
     if not FLASK_AVAILABLE:
         print("❌ Flask is required. Install with: pip install flask")
         sys.exit(1)
 
+    # The PDF routes set their own cache headers
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+
     print("\n" + "="*60)
     print("🎨 INDESIGN LIVE PREVIEW SERVER")
     print("="*60)
@@ -499,8 +815,18 @@ def main():
     print("\n🚀 Starting server on http://localhost:5000")
     print("="*60 + "\n")
 
-    # Run Flask server
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    # Connect to InDesign in the background; requests arriving first wait in get_server()
+    threading.Thread(target=get_server, daemon=True).start()
+
+    # The reloader would import this module twice and probe InDesign twice, so it stays off
+    if args.debug:
+        app.run(debug=True, use_reloader=False, threaded=True, port=5000, host='0.0.0.0')
+    # Run under waitress' thread pool so /status and /pdf aren't blocked behind an export
+    elif WAITRESS_AVAILABLE:
+        serve(app, host='0.0.0.0', port=5000, threads=8, channel_timeout=60)
+    else:
+        print("⚠️  waitress not installed, using Flask's threaded dev server. Run: pip install waitress")
+        app.run(debug=False, threaded=True, port=5000, host='0.0.0.0')
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
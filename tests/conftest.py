@@ -0,0 +1,63 @@
+"""
+Shared pytest setup for the Python modules at the repository root.
+
+The InDesign client (core, socket_client) lives in the adb-mcp checkout and the
+MCP SDK is optional, so minimal stand-ins are registered when they are missing.
+Tests patch sendCommand on the module under test rather than relying on these.
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _stub_module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def _unavailable(command):
+    raise ConnectionError("InDesign proxy not available in tests")
+
+
+try:
+    import core  # noqa: F401
+except ImportError:
+    _stub_module(
+        "core",
+        init=lambda application, client: None,
+        createCommand=lambda action, options: {"action": action, "options": options},
+        sendCommand=_unavailable,
+    )
+
+try:
+    import socket_client  # noqa: F401
+except ImportError:
+    _stub_module("socket_client", configure=lambda **kwargs: None)
+
+try:
+    import mcp.server.fastmcp  # noqa: F401
+except ImportError:
+    class _FastMCP:
+        """Registers nothing; tools stay plain functions"""
+
+        def __init__(self, name, **kwargs):
+            self.name = name
+
+        def tool(self, *args, **kwargs):
+            return lambda fn: fn
+
+        def resource(self, *args, **kwargs):
+            return lambda fn: fn
+
+        def run(self):
+            pass
+
+    _stub_module("mcp")
+    _stub_module("mcp.server")
+    _stub_module("mcp.server.fastmcp", FastMCP=_FastMCP)
@@ -0,0 +1,187 @@
+"""Tests for the full InDesign MCP server's response handling and batched exports"""
+
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+from conftest import ROOT
+
+
+@pytest.fixture(scope="module")
+def server():
+    # The file name has a hyphen, so it can't be imported by name
+    spec = importlib.util.spec_from_file_location(
+        "indesign_mcp_full", os.path.join(ROOT, "indesign-mcp-full.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def clear_request_cache(server):
+    server._request_cache.clear()
+    yield
+    server._request_cache.clear()
+
+
+QUEUED = {"status": "SUCCESS", "response": {"queued": True}}
+
+
+class TestIdempotencyCache:
+    def test_result_is_replayed_for_the_same_key(self, server):
+        first = server._handle_response({"status": "SUCCESS", "response": {"id": 1}}, "req-1")
+        again = server._handle_response({"status": "SUCCESS", "response": {"id": 2}}, "req-1")
+        assert again is first
+        assert again["data"] == {"id": 1}
+
+    def test_queued_ack_is_not_cached(self, server):
+        ack = server._handle_response(QUEUED, "req-2")
+        assert ack["data"] == {"queued": True}
+        assert "req-2" not in server._request_cache
+
+        # The retry gets the real outcome, which is then cached
+        done = server._handle_response({"status": "SUCCESS", "response": {"id": 7}}, "req-2")
+        assert done["data"] == {"id": 7}
+        assert server._request_cache["req-2"] is done
+
+    def test_no_key_caches_nothing(self, server):
+        server._handle_response({"status": "SUCCESS", "response": {}})
+        assert server._request_cache == {}
+
+
+class TestExportVariants:
+    def test_every_failed_variant_is_reported(self, server, monkeypatch, tmp_path):
+        variants = [{"outputPath": str(tmp_path / f"v{i}.pdf")} for i in range(3)]
+
+        def send(command):
+            assert command["action"] == "batch"
+            assert len(command["options"]["ops"]) == 3
+            return {"status": "SUCCESS", "response": {"results": [
+                {"status": "ERROR", "message": "preset missing"},
+                {"status": "SUCCESS"},
+                {"status": "ERROR", "message": "disk full"},
+            ]}}
+
+        monkeypatch.setattr(server, "sendCommand", send)
+
+        result = asyncio.run(server.export_variants(variants))
+        assert result["ok"] is False
+        assert result["error"]["msg"] == "2 of 3 variants failed"
+        assert result["error"]["details"]["failed"] == [
+            {"outputPath": variants[0]["outputPath"], "error": "preset missing"},
+            {"outputPath": variants[2]["outputPath"], "error": "disk full"},
+        ]
+
+    def test_all_variants_succeed(self, server, monkeypatch, tmp_path):
+        variants = [{"outputPath": str(tmp_path / f"v{i}.pdf")} for i in range(2)]
+        monkeypatch.setattr(server, "sendCommand", lambda command: {
+            "status": "SUCCESS", "response": {"results": [{"status": "SUCCESS"}, {"status": "SUCCESS"}]}
+        })
+
+        result = asyncio.run(server.export_variants(variants))
+        assert result["ok"] is True
+        assert [v["outputPath"] for v in result["data"]["exports"]] == [v["outputPath"] for v in variants]
+
+
+class TestOutbox:
+    def test_queued_commands_are_sent_one_by_one(self, server, monkeypatch, capsys):
+        sent = []
+
+        def send(command):
+            sent.append(command["action"])
+            if command["action"] == "bad":
+                return {"status": "ERROR", "message": "no such frame"}
+            return {"status": "SUCCESS", "response": {}}
+
+        monkeypatch.setattr(server, "sendCommand", send)
+
+        for action in ("first", "bad", "last"):
+            ack = server._send_command(server.createCommand(action, {}), await_response=False)
+            assert ack == QUEUED
+
+        result = server.flush_and_sync()
+        assert sent == ["first", "bad", "last"]
+        assert result["ok"] is False
+        assert result["error"]["msg"] == "1 of 3 queued sends failed"
+        assert result["error"]["details"] == ["no such frame"]
+        assert "Queued command failed: no such frame" in capsys.readouterr().err
+
+        # Reported failures are cleared once synced
+        assert server.flush_and_sync() == {"ok": True, "data": {"flushed": 0}}
+
+    def test_failures_are_recorded_without_a_sync(self, server, monkeypatch):
+        def send(command):
+            raise ConnectionError("proxy dropped")
+
+        monkeypatch.setattr(server, "sendCommand", send)
+
+        for _ in range(server._queued_errors.maxlen + 5):
+            server._send_command(server.createCommand("noop", {}), await_response=False)
+        server._flush_outbox()
+        server._sender.submit(lambda: None).result()
+
+        assert len(server._queued_errors) == server._queued_errors.maxlen
+        result = server.flush_and_sync()
+        n = server._queued_errors.maxlen + 5
+        assert result["error"]["msg"] == f"{n} of {n} queued sends failed"
+
+
+class TestLinkPaths:
+    @pytest.fixture
+    def links(self, server, monkeypatch, tmp_path):
+        for name in ("img", "images", "new"):
+            (tmp_path / name).mkdir()
+        paths = {
+            "img": str(tmp_path / "img"),
+            "a": str(tmp_path / "img" / "a.png"),
+            "b": str(tmp_path / "images" / "b.png"),
+            "new": str(tmp_path / "new"),
+        }
+        monkeypatch.setattr(server, "_link_paths", {paths["a"]: None, paths["b"]: None})
+        monkeypatch.setattr(server, "sendCommand", lambda command: {"status": "SUCCESS", "response": {}})
+        return paths
+
+    def test_replace_matches_whole_directories(self, server, links):
+        result = server.link_replace_all(links["img"], links["new"])
+        assert result["ok"] is True
+        assert list(server._link_paths) == [links["b"], os.path.join(links["new"], "a.png")]
+
+    def test_queued_replace_leaves_tracked_links_alone(self, server, links):
+        result = server.link_replace_all(links["img"], links["new"], await_response=False)
+        assert result["data"] == {"queued": True}
+        assert list(server._link_paths) == [links["a"], links["b"]]
+        assert server.flush_and_sync()["ok"] is True
+
+    def test_preflight_reports_missing_links_locally(self, server, links, monkeypatch):
+        def send(command):
+            raise AssertionError("preflight should not reach InDesign")
+
+        monkeypatch.setattr(server, "sendCommand", send)
+        result = server.preflight_run()
+        assert result["data"]["source"] == "local"
+        assert {e["path"] for e in result["data"]["errors"]} == {links["a"], links["b"]}
+
+
+class TestValidatePath:
+    def test_output_paths_are_not_stat_ed(self, server, monkeypatch, tmp_path):
+        calls = []
+        stat = os.stat
+        monkeypatch.setattr(os, "stat", lambda path, *a, **k: calls.append(path) or stat(path, *a, **k))
+
+        path, st = server._validate_path(str(tmp_path / "out.pdf"))
+        assert (path, st) == (os.path.realpath(str(tmp_path / "out.pdf")), None)
+        assert calls == []
+
+    def test_input_paths_come_with_their_stat(self, server, tmp_path):
+        existing = tmp_path / "in.csv"
+        existing.write_text("a,b\n")
+
+        assert server._validate_path(str(existing), stat=True)[1].st_size == 4
+        assert server._validate_path(str(tmp_path / "missing.csv"), stat=True)[1] is None
+
+    def test_relative_paths_are_rejected(self, server):
+        with pytest.raises(ValueError, match="absolute"):
+            server._validate_path("exports/out.pdf")
@@ -0,0 +1,109 @@
+"""Tests for the InDesign job bridge's QA validation"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+for _name in ("fastapi", "pydantic", "socketio", "uvicorn"):
+    pytest.importorskip(_name)
+
+
+@pytest.fixture(scope="module")
+def bridge():
+    spec = importlib.util.spec_from_file_location(
+        "indesign_mcp_http_bridge", os.path.join(ROOT, "mcp-local", "indesign_mcp_http_bridge.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def validations(bridge, monkeypatch):
+    """Count validator runs; the fake passes every PDF at score 97"""
+    runs = []
+
+    def validate(pdf_path, threshold=80, job_config=None):
+        runs.append((pdf_path, threshold))
+        return {"score": 97, "threshold": threshold, "passing": 97 >= threshold, "issues": []}
+
+    monkeypatch.setattr(bridge, "_validate_fn", validate)
+    bridge._qa_cache.clear()
+    yield runs
+    bridge._qa_cache.clear()
+
+
+def _pdf(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestQaCache:
+    def test_unchanged_pdf_reuses_a_copy_of_the_report(self, bridge, validations, tmp_path):
+        pdf = _pdf(tmp_path, "a.pdf", b"%PDF-1.7 a")
+
+        first = asyncio.run(bridge._run_validation(pdf, 95))
+        first["issues"].append("mutated by caller")
+        second = asyncio.run(bridge._run_validation(pdf, 95))
+
+        assert validations == [(pdf, 95)]
+        assert second["issues"] == []
+
+        # Same content under another name, but a different threshold, validates again
+        copy_pdf = _pdf(tmp_path, "b.pdf", b"%PDF-1.7 a")
+        asyncio.run(bridge._run_validation(copy_pdf, 95))
+        asyncio.run(bridge._run_validation(copy_pdf, 90))
+        assert validations == [(pdf, 95), (copy_pdf, 90)]
+
+    def test_least_recently_used_report_is_evicted(self, bridge, validations, tmp_path, monkeypatch):
+        monkeypatch.setattr(bridge, "QA_CACHE_SIZE", 2)
+        pdfs = [_pdf(tmp_path, f"{i}.pdf", b"%%PDF-1.7 %d" % i) for i in range(3)]
+
+        for pdf in pdfs:
+            asyncio.run(bridge._run_validation(pdf, 90))
+        asyncio.run(bridge._run_validation(pdfs[0], 90))
+
+        assert len(bridge._qa_cache) == 2
+        assert [p for p, _ in validations] == pdfs + [pdfs[0]]
+
+    def test_missing_validator_fails_qa_without_caching(self, bridge, tmp_path, monkeypatch):
+        monkeypatch.setattr(bridge, "_validate_fn", None)
+        monkeypatch.setitem(sys.modules, "validate_document", None)
+        bridge._qa_cache.clear()
+
+        report = asyncio.run(bridge._run_validation(_pdf(tmp_path, "a.pdf", b"%PDF"), 90))
+
+        assert report["passing"] is False
+        assert "QA validator unavailable" in report["error"]
+        assert not bridge._qa_cache
+
+
+class TestQaThreshold:
+    def _job(self, bridge, world_class, qa):
+        return bridge.Job(
+            jobId="job-1", jobType="partnership", worldClass=world_class, templateId="t",
+            output={}, export={}, qa=qa, data={}
+        )
+
+    @pytest.mark.parametrize("world_class, qa, expected", [
+        (True, {}, 95),
+        (True, {"threshold": 80}, 95),
+        (True, {"threshold": 98}, 98),
+        (True, {"threshold": 0}, 95),
+        (False, {}, 90),
+        (False, {"threshold": 85}, 90),
+        (False, {"threshold": 0}, 0),
+    ])
+    def test_threshold(self, bridge, world_class, qa, expected):
+        assert bridge._qa_threshold(self._job(bridge, world_class, qa)) == expected
+
+    def test_zero_threshold_skips_scoring(self, bridge, validations, tmp_path):
+        report = asyncio.run(bridge._run_validation(_pdf(tmp_path, "a.pdf", b"%PDF"), 0))
+        assert report == {"passing": True, "skipped": True, "threshold": 0}
+        assert validations == []
@@ -0,0 +1,110 @@
+"""Tests for the HTTP → WS bridge's per-connection response routing"""
+
+import asyncio
+import importlib.util
+import json
+import os
+
+import pytest
+
+from conftest import ROOT
+
+for _name in ("fastapi", "pydantic", "websockets", "httpx"):
+    pytest.importorskip(_name)
+
+
+@pytest.fixture(scope="module")
+def bridge():
+    spec = importlib.util.spec_from_file_location(
+        "mcp_http_bridge", os.path.join(ROOT, "mcp-local", "mcp_http_bridge.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeWS:
+    """Stands in for a proxy connection; replies are queued by the test"""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def reply(self, msg_id, **fields):
+        self.incoming.put_nowait(json.dumps({"type": "RESPONSE", "id": msg_id, **fields}))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raw = await self.incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+    async def close(self):
+        self.closed = True
+
+
+def _start_reader(bridge, ws):
+    pending = bridge._ws_pending[ws] = {}
+    return asyncio.create_task(bridge._recv_loop(ws, pending))
+
+
+def test_replies_reach_their_own_command(bridge):
+    async def scenario():
+        ws = FakeWS()
+        reader = _start_reader(bridge, ws)
+        calls = [
+            asyncio.create_task(bridge._send_ws_command(ws, "indesign", name, {}, timeout=5))
+            for name in ("first", "second")
+        ]
+        while len(ws.sent) < 2:
+            await asyncio.sleep(0)
+
+        first, second = ws.sent
+        assert first["type"] == "COMMAND" and first["application"] == "indesign"
+        # Out of order, with junk in between
+        ws.reply(second["id"], result="two")
+        ws.incoming.put_nowait("not json")
+        ws.incoming.put_nowait("[1, 2]")
+        ws.reply(first["id"], result="one")
+
+        results = await asyncio.gather(*calls)
+        ws.incoming.put_nowait(None)
+        await reader
+        return results
+
+    one, two = asyncio.run(scenario())
+    assert (one["result"], two["result"]) == ("one", "two")
+
+
+def test_reader_exit_fails_waiters_and_closes_connection(bridge):
+    async def scenario():
+        ws = FakeWS()
+        reader = _start_reader(bridge, ws)
+        call = asyncio.create_task(bridge._send_ws_command(ws, "indesign", "slow", {}, timeout=5))
+        while not ws.sent:
+            await asyncio.sleep(0)
+
+        ws.incoming.put_nowait(None)
+        await reader
+        with pytest.raises(ConnectionError):
+            await call
+        # Later commands on the dead connection fail fast
+        with pytest.raises(ConnectionError, match="reader stopped"):
+            await bridge._send_ws_command(ws, "indesign", "late", {}, timeout=5)
+        return ws
+
+    ws = asyncio.run(scenario())
+    assert ws.closed
+    assert ws not in bridge._ws_pending
+
+
+def test_pool_defaults_to_one_connection(bridge):
+    if "MCP_BRIDGE_POOL_SIZE" not in os.environ:
+        assert bridge.POOL_SIZE == 1
@@ -0,0 +1,246 @@
+"""Tests for the export pipeline"""
+
+import re
+import subprocess
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pipeline
+from pipeline import InDesignPipeline, PipelineStep, topological_stages
+
+
+def _step(name, *deps):
+    return PipelineStep(name, lambda ctx: True, list(deps))
+
+
+def _names(stages):
+    return [sorted(step.name for step in stage) for stage in stages]
+
+
+class TestTopologicalStages:
+    def test_independent_steps_share_a_stage(self):
+        stages = topological_stages([
+            _step("connect"),
+            _step("export_pdf", "connect"),
+            _step("export_png", "connect"),
+            _step("validate", "export_pdf"),
+        ])
+        assert _names(stages) == [["connect"], ["export_pdf", "export_png"], ["validate"]]
+
+    def test_diamond_waits_for_both_parents(self):
+        stages = topological_stages([
+            _step("report", "left", "right"),
+            _step("left", "root"),
+            _step("right", "root"),
+            _step("root"),
+        ])
+        assert _names(stages) == [["root"], ["left", "right"], ["report"]]
+
+    def test_unknown_dependency(self):
+        with pytest.raises(ValueError, match="unknown step 'missing'"):
+            topological_stages([_step("export", "missing")])
+
+    def test_cycle(self):
+        with pytest.raises(ValueError, match="cycle"):
+            topological_stages([_step("a", "b"), _step("b", "a"), _step("c")])
+
+
+@pytest.fixture
+def bare_pipeline():
+    """An InDesignPipeline with logging only, no config or InDesign connection"""
+    p = InDesignPipeline.__new__(InDesignPipeline)
+    p._submit_queue = []
+    p.logged = []
+    p.log_step = lambda name, success, details=None: p.logged.append((name, success, details))
+    p._build_export_command = lambda fmt: (
+        (f"/exports/out.{fmt}", {"action": f"export{fmt.upper()}", "options": {"outputPath": f"/exports/out.{fmt}"}})
+        if fmt in ("pdf", "png") else None
+    )
+    return p
+
+
+class TestExportDocuments:
+    def test_partial_batch_failure_keeps_good_formats(self, bare_pipeline, monkeypatch):
+        sent = []
+
+        def send(command):
+            sent.append(command)
+            return {"status": "SUCCESS", "response": {"results": [
+                {"status": "SUCCESS", "response": {}},
+                {"status": "ERROR", "message": "PNG export failed"},
+            ]}}
+
+        monkeypatch.setattr(pipeline, "sendCommand", send)
+
+        assert bare_pipeline.export_documents(["pdf", "png"]) == ["/exports/out.pdf"]
+        assert len(sent) == 1 and sent[0]["action"] == "batch"
+        assert [op["tool"] for op in sent[0]["options"]["ops"]] == ["exportPDF", "exportPNG"]
+        assert bare_pipeline.logged == [
+            ("Export PDF", True, "/exports/out.pdf"),
+            ("Export PNG", False, "PNG export failed"),
+        ]
+
+    def test_rejected_batch_falls_back_to_one_command_per_format(self, bare_pipeline, monkeypatch):
+        sent = []
+
+        def send(command):
+            sent.append(command["action"])
+            if command["action"] == "batch":
+                return {"status": "ERROR", "message": "Unknown command: batch"}
+            if command["action"] == "exportPNG":
+                raise ConnectionError("proxy dropped")
+            return {"status": "SUCCESS", "response": {}}
+
+        monkeypatch.setattr(pipeline, "sendCommand", send)
+
+        assert bare_pipeline.export_documents(["pdf", "png"]) == ["/exports/out.pdf"]
+        assert sent == ["batch", "exportPDF", "exportPNG"]
+        assert bare_pipeline.logged[1] == ("Export PNG", False, "proxy dropped")
+
+    @pytest.mark.parametrize("reply", [
+        {"status": "SUCCESS", "response": {"results": [{}]}},
+        {"status": "SUCCESS", "response": {}},
+        {"status": "ERROR", "message": "Export folder is read-only"},
+        ConnectionError("proxy dropped"),
+    ])
+    def test_batch_that_may_have_run_is_not_resent(self, bare_pipeline, monkeypatch, reply):
+        sent = []
+
+        def send(command):
+            sent.append(command["action"])
+            if isinstance(reply, Exception):
+                raise reply
+            return reply
+
+        monkeypatch.setattr(pipeline, "sendCommand", send)
+
+        assert bare_pipeline.export_documents(["pdf", "png"]) == []
+        assert sent == ["batch"]
+        assert [(name, ok) for name, ok, _ in bare_pipeline.logged] == [
+            ("Export PDF", False), ("Export PNG", False)
+        ]
+
+    def test_unsupported_format_is_logged_and_skipped(self, bare_pipeline, monkeypatch):
+        monkeypatch.setattr(pipeline, "sendCommand", lambda command: {"status": "SUCCESS", "response": {}})
+
+        assert bare_pipeline.export_documents(["pdf", "tiff"]) == ["/exports/out.pdf"]
+        assert ("Export TIFF", False, "Unsupported format") in bare_pipeline.logged
+
+
+class TestAtomicWrite:
+    def test_concurrent_writers_use_their_own_temp_files(self, tmp_path):
+        report = tmp_path / "report.json"
+        payloads = [bytes([65 + i]) * 200_000 for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda data: pipeline._atomic_write(str(report), data), payloads * 4))
+
+        # Whichever write landed last, the file is one writer's complete payload
+        assert report.read_bytes() in payloads
+        assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path):
+        with pytest.raises(TypeError):
+            pipeline._atomic_write(str(tmp_path / "report.json"), "not bytes")
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestJsonCache:
+    def test_nested_values_are_not_shared_between_loads(self, bare_pipeline, tmp_path, monkeypatch):
+        job = tmp_path / "job.json"
+        job.write_text('{"qaProfile": {"min_score": 90, "checks": ["fonts"]}}')
+        reads = []
+        read_json = pipeline._read_json
+        monkeypatch.setattr(pipeline, "_read_json", lambda path: reads.append(path) or read_json(path))
+        pipeline._load_json_cached.cache_clear()
+        bare_pipeline.config = {}
+
+        first = bare_pipeline.load_qa_profile(str(job))
+        first["checks"].append("mutated by job")
+        second = bare_pipeline.load_qa_profile(str(job))
+
+        assert second == {"min_score": 90, "checks": ["fonts"]}
+        assert len(reads) == 1
+        pipeline._load_json_cached.cache_clear()
+
+
+class TestValidatePdfCache:
+    @pytest.fixture
+    def validations(self, monkeypatch):
+        """Count DocumentValidator runs; the fake scores every PDF 95"""
+        runs = []
+
+        class DocumentValidator:
+            def __init__(self, pdf_path, parallelism=1):
+                self.pdf_path = pdf_path
+
+            def validate_all(self):
+                runs.append(self.pdf_path)
+                return {"score": 95, "max_score": 100, "checks": {"fonts": ["Lora"]}}
+
+        monkeypatch.setitem(sys.modules, "validate_document", types.SimpleNamespace(DocumentValidator=DocumentValidator))
+        pipeline._validate_pdf_cached.cache_clear()
+        yield runs
+        pipeline._validate_pdf_cached.cache_clear()
+
+    @pytest.fixture
+    def validating_pipeline(self, bare_pipeline):
+        bare_pipeline.config = {"validation_threshold": 90}
+        bare_pipeline.results = {}
+        return bare_pipeline
+
+    def test_unchanged_pdf_is_validated_once(self, validating_pipeline, validations, tmp_path):
+        pdf = tmp_path / "out.pdf"
+        pdf.write_bytes(b"%PDF-1.7 one")
+
+        first = validating_pipeline.validate_pdf(str(pdf))
+        first["checks"]["fonts"].append("mutated by caller")
+        second = validating_pipeline.validate_pdf(str(pdf))
+
+        assert len(validations) == 1
+        assert second["checks"]["fonts"] == ["Lora"]
+
+    def test_rewritten_pdf_is_validated_again(self, validating_pipeline, validations, tmp_path):
+        pdf = tmp_path / "out.pdf"
+        pdf.write_bytes(b"%PDF-1.7 one")
+        validating_pipeline.validate_pdf(str(pdf))
+        pdf.write_bytes(b"%PDF-1.7 second revision")
+        validating_pipeline.validate_pdf(str(pdf))
+
+        assert len(validations) == 2
+
+
+class TestSearchProcOutput:
+    PATTERN = re.compile(r"Score: (\d+)")
+
+    def test_large_stderr_does_not_block(self):
+        # Far more stderr than a pipe buffer holds, written before any stdout
+        script = (
+            "import sys\n"
+            "sys.stderr.write('x' * (4 << 20))\n"
+            "sys.stderr.flush()\n"
+            "print('Score: 97')\n"
+        )
+        start = time.monotonic()
+        returncode, match, stderr = pipeline._search_proc_output(
+            [sys.executable, "-c", script], self.PATTERN, timeout=30
+        )
+        assert time.monotonic() - start < 20
+        assert returncode == 0
+        assert match.group(1) == "97"
+        assert len(stderr) == 4 << 20
+
+    def test_no_match(self):
+        returncode, match, stderr = pipeline._search_proc_output(
+            [sys.executable, "-c", "import sys; print('nothing'); sys.exit(3)"], self.PATTERN, timeout=30
+        )
+        assert (returncode, match, stderr) == (3, None, "")
+
+    def test_timeout_kills_the_process(self):
+        with pytest.raises(subprocess.TimeoutExpired):
+            pipeline._search_proc_output(
+                [sys.executable, "-c", "import time; time.sleep(30)"], self.PATTERN, timeout=0.5
+            )
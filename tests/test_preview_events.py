@@ -0,0 +1,57 @@
+"""Tests for the preview server's /events stream"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+
+import preview_server
+
+
+class FakeServer:
+    """Latest export is generation 3; waiting for a newer one just times out"""
+    _pdf_etag = "etag-3"
+
+    def wait_for_export(self, generation, timeout):
+        if generation != 3:
+            return 3
+        time.sleep(0.02)
+        return 3
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(preview_server, "preview_server", FakeServer())
+    monkeypatch.setattr(preview_server, "STREAM_MAX_SECONDS", 0.2)
+    monkeypatch.setattr(preview_server, "_event_streams", threading.BoundedSemaphore(1))
+    return preview_server.app.test_client()
+
+
+def test_streams_beyond_the_cap_get_503_with_retry(client):
+    first = client.get("/events?g=1", buffered=False)
+    assert first.status_code == 200
+
+    refused = client.get("/events")
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"] == "30"
+    assert refused.get_data(as_text=True) == "retry: 30000\n\n"
+
+    # Closing a stream frees its slot
+    first.close()
+    again = client.get("/events", buffered=False)
+    assert again.status_code == 200
+    again.close()
+
+
+def test_stream_resumes_from_last_event_id_and_ends_at_deadline(client):
+    caught_up = client.get("/events", headers={"Last-Event-ID": "3"})
+    body = caught_up.get_data(as_text=True)
+    assert "data:" not in body
+    assert body.startswith(": keep-alive")
+    caught_up.close()
+
+    behind = client.get("/events?g=1")
+    assert behind.get_data(as_text=True).startswith('id: 3\ndata: {"generation": 3, "etag": "etag-3"}\n\n')
+    behind.close()
@@ -0,0 +1,85 @@
+"""Tests for the preview server's export handling"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from preview_server import InDesignPreviewServer
+
+
+@pytest.fixture
+def server():
+    """An InDesignPreviewServer with only the export bookkeeping set up"""
+    s = InDesignPreviewServer.__new__(InDesignPreviewServer)
+    s._export_lock = threading.Lock()
+    s._export_in_flight = None
+    return s
+
+
+def test_concurrent_callers_share_one_export(server):
+    calls = []
+    release = threading.Event()
+
+    def export():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return "/tmp/preview.pdf"
+
+    server._export = export
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(server.export_current_document)
+        while server._export_in_flight is None:
+            threading.Event().wait(0.01)
+        # Callers arriving mid-export join it rather than starting their own
+        followers = [pool.submit(server.export_current_document) for _ in range(3)]
+        threading.Event().wait(0.1)
+        release.set()
+        results = [f.result(timeout=5) for f in [leader, *followers]]
+
+    assert results == ["/tmp/preview.pdf"] * 4
+    assert len(calls) == 1
+    assert server._export_in_flight is None
+
+
+def test_failure_reaches_followers_and_next_call_retries(server):
+    attempts = []
+    release = threading.Event()
+
+    def export():
+        attempts.append(1)
+        if len(attempts) == 1:
+            release.wait(5)
+            raise RuntimeError("export failed")
+        return "/tmp/preview.pdf"
+
+    server._export = export
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(server.export_current_document)
+        while server._export_in_flight is None:
+            threading.Event().wait(0.01)
+        follower = pool.submit(server.export_current_document)
+        threading.Event().wait(0.1)
+        release.set()
+        for f in (leader, follower):
+            with pytest.raises(RuntimeError, match="export failed"):
+                f.result(timeout=5)
+
+    assert server.export_current_document() == "/tmp/preview.pdf"
+    assert len(attempts) == 2
+
+
+def test_cleanup_removes_only_legacy_previews(tmp_path):
+    legacy = tmp_path / "preview_20251107_143015.pdf"
+    keep = ["preview.pdf", "preview_report.pdf", "preview_2025_draft.pdf", "other.pdf"]
+    legacy.write_bytes(b"%PDF")
+    for name in keep:
+        (tmp_path / name).write_bytes(b"%PDF")
+
+    s = InDesignPreviewServer.__new__(InDesignPreviewServer)
+    s.export_path = str(tmp_path)
+    s._cleanup_old()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(keep)
@@ -8,6 +8,9 @@ import sys
 import os
 import json
 import re
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add optional imports with graceful fallback
@@ -38,6 +41,57 @@ from core import init, sendCommand, createCommand
 import socket_client
 from health import check_indesign_health, MCPHealthStatus
 
+def _extract_pages_text(args):
+    """Pool worker: extract text for a contiguous run of page indices"""
+    pdf_path, page_indices = args
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i].extract_text() for i in page_indices]
+
+# Shared page-extraction pool, created on first use and reused for every validation
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+def get_page_pool(workers):
+    """
+    Return the shared process pool for page text extraction, creating it once.
+
+    Uses the spawn start method: validators run inside thread pools (pipeline DAG
+    stages, bridge and preview workers), and forking a threaded process can deadlock.
+    The pool size is fixed by the first caller.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+def extract_pages_text(pdf, pdf_path, parallelism=1):
+    """
+    Extract the text of every page, optionally splitting pages across worker processes.
+
+    Args:
+        pdf: Open pdfplumber document (used directly when running serially)
+        pdf_path: Path to the PDF, re-opened by each pool worker
+        parallelism: Worker processes to use; 1 (the default) or a single page runs in-process
+
+    Returns:
+        List of page texts (None for pages without text), in page order
+    """
+    page_count = len(pdf.pages)
+    processes = min(parallelism, page_count)
+    if processes <= 1:
+        return [page.extract_text() for page in pdf.pages]
+
+    # One contiguous chunk per worker so each opens the PDF only once
+    chunk = -(-page_count // processes)
+    chunks = [(pdf_path, range(start, min(start + chunk, page_count)))
+              for start in range(0, page_count, chunk)]
+    pool = get_page_pool(parallelism)
+    return [text for texts in pool.map(_extract_pages_text, chunks) for text in texts]
+
 class MCPConnectionError(Exception):
     """Raised when MCP connection is required but unavailable"""
     pass
@@ -45,8 +99,9 @@ class MCPConnectionError(Exception):
 class DocumentValidator:
     """Comprehensive document validation for InDesign exports"""
 
-    def __init__(self, pdf_path=None, job_config=None, job_config_path=None):
+    def __init__(self, pdf_path=None, job_config=None, job_config_path=None, parallelism=1):
         self.pdf_path = pdf_path
+        self.parallelism = parallelism  # Worker processes for per-page checks
 
         # Load job config from path if provided
         if job_config_path and os.path.exists(job_config_path):
@@ -309,8 +364,7 @@ class DocumentValidator:
             with pdfplumber.open(self.pdf_path) as pdf:
                 # Extract all text
                 full_text = ""
-                for page in pdf.pages:
-                    text = page.extract_text()
+                for text in extract_pages_text(pdf, self.pdf_path, self.parallelism):
                     if text:
                         full_text += text + "\n"
 
@@ -1214,6 +1268,24 @@ class DocumentValidator:
         # Generate and return report
         return self.generate_report()
 
+def validate(pdf_path, threshold=80, job_config=None):
+    """
+    Validate a PDF in-process and return the report with a pass/fail verdict.
+
+    Args:
+        pdf_path: Path to PDF file to validate
+        threshold: Minimum score required to pass
+        job_config: Optional job config dict for intent-aware validation
+
+    Returns:
+        validate_all() report plus "threshold" and "passing" keys
+    """
+    validator = DocumentValidator(pdf_path, job_config)
+    report = validator.validate_all()
+    report["threshold"] = threshold
+    report["passing"] = validator.score >= threshold
+    return report
+
 def main():
     """Main validation entry point"""
     import argparse